@@ -0,0 +1,313 @@
+"""
+Micro-benchmarks for the BasePage primitives.
+
+The suite serves the local HTML fixtures from 'benchmarks/fixtures', drives them with BasePage in headless
+Chrome and/or Firefox and times every primitive over many iterations. Results are written as JSON so that
+runs made on different commits can be compared with the 'compare' command.
+
+Usage:
+    python -m benchmarks.bench_base_page run --browsers chrome firefox --iterations 30
+    python -m benchmarks.bench_base_page run --cases click get_text --output my_run.json
+    python -m benchmarks.bench_base_page run --wait-engine observer
+    python -m benchmarks.bench_base_page run --fast-path
+    python -m benchmarks.bench_base_page run --disable-animations
+    python -m benchmarks.bench_base_page compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import datetime
+import functools
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import selenium
+from selenium.webdriver.common.by import By
+
+from utilities.driver_factory import CHROME, FIREFOX, close_fast_path, create_driver_factory, \
+    create_driver_options
+from utilities.run_info import current_commit, percentile
+from utilities.ui_utilities.animations import click_retry_stats
+from utilities.ui_utilities.base_page import BasePage
+from utilities.ui_utilities.select2 import Select2
+from utilities.ui_utilities.wait_engines import WAIT_ENGINES
+
+_fixtures_path = Path(__file__).parent.joinpath("fixtures")
+_results_path = Path(__file__).parent.joinpath("results")
+
+BROWSERS = {
+    "chrome": CHROME,
+    "firefox": FIREFOX
+}
+
+# Delay (ms) after which delayed elements appear, vanishing elements hide and the overlay starts fading out.
+DEFAULT_DELAY_MS = 300
+
+
+class BenchmarkCase:
+    """
+    A single timed BasePage call against the primitives fixture.
+
+    Attributes:
+    - name: The name the case is reported under.
+    - action: Callable receiving a BasePage instance; only this call is timed.
+    - delay_ms: Delay passed to the fixture reset, i.e. the time the page needs before the call can succeed.
+    - requires_select2: Whether the case needs the select2 widget to be loaded on the fixture page.
+    """
+
+    def __init__(self, name, action, delay_ms=0, requires_select2=False):
+        self.name = name
+        self.action = action
+        self.delay_ms = delay_ms
+        self.requires_select2 = requires_select2
+
+
+def _select2_pick_town(page):
+    page.click((By.CSS_SELECTOR, "#town-select + .select2 .select2-selection"))
+    page.send_keys((By.CSS_SELECTOR, ".select2-search__field"), "Київ", is_clear=False)
+    page.click((By.XPATH, '//li[text()="Київ"]'))
+
+
+def _select2_component_pick_town(page, fast_mode):
+    town = Select2(page._driver, (By.ID, "town-select"))
+    town.fast_mode = fast_mode
+    town.select_by_text("Київ", exact=True)
+
+
+CASES = [
+    BenchmarkCase("send_keys", lambda page: page.send_keys((By.ID, "text-input"), "шуруп")),
+    BenchmarkCase("click", lambda page: page.click((By.ID, "plain-button"))),
+    BenchmarkCase("click_via_js", lambda page: page.click_via_js((By.ID, "plain-button"))),
+    BenchmarkCase("get_text", lambda page: page.get_text((By.ID, "text-block"))),
+    BenchmarkCase("move_cursor_to_element", lambda page: page.move_cursor_to_element((By.ID, "hover-target"))),
+    BenchmarkCase("is_not_displayed_absent", lambda page: page.is_not_displayed((By.ID, "missing-element"))),
+    BenchmarkCase("is_not_displayed_snapshot",
+                  lambda page: page.is_not_displayed((By.ID, "missing-element"), snapshot=True)),
+    BenchmarkCase("is_not_displayed_vanishing", lambda page: page.is_not_displayed((By.ID, "vanishing")),
+                  delay_ms=DEFAULT_DELAY_MS),
+    BenchmarkCase("click_delayed", lambda page: page.click((By.ID, "delayed-button")), delay_ms=DEFAULT_DELAY_MS),
+    BenchmarkCase("wait_for_element_clickable_and_click_overlay",
+                  lambda page: page.wait_for_element_clickable_and_click((By.ID, "covered-button")),
+                  delay_ms=DEFAULT_DELAY_MS),
+    BenchmarkCase("select2_pick_option", _select2_pick_town, requires_select2=True),
+    BenchmarkCase("select2_component_select_by_text",
+                  functools.partial(_select2_component_pick_town, fast_mode=False), requires_select2=True),
+    BenchmarkCase("select2_component_fast_mode",
+                  functools.partial(_select2_component_pick_town, fast_mode=True), requires_select2=True),
+]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Serves the benchmark fixtures over HTTP from a background thread.
+
+    Example:
+    with FixtureServer() as server:
+        driver.get(server.url("primitives.html"))
+    """
+
+    def __init__(self, directory=_fixtures_path):
+        handler = functools.partial(_QuietHandler, directory=str(directory))
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, name):
+        """
+        Builds the URL of a fixture file.
+
+        Parameters:
+        - name: The fixture file name relative to the fixtures directory.
+
+        Returns:
+        - str: The URL the fixture is served under.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{name}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def summarize(samples):
+    """
+    Reduces a list of timings to summary statistics.
+
+    Parameters:
+    - samples: Durations in seconds.
+
+    Returns:
+    - dict: Statistics in milliseconds plus the raw samples.
+    """
+    ordered = sorted(samples)
+    to_ms = 1000
+    return {
+        "iterations": len(ordered),
+        "min_ms": ordered[0] * to_ms,
+        "median_ms": statistics.median(ordered) * to_ms,
+        "mean_ms": statistics.fmean(ordered) * to_ms,
+        "p90_ms": percentile(ordered, 0.90) * to_ms,
+        "p95_ms": percentile(ordered, 0.95) * to_ms,
+        "max_ms": ordered[-1] * to_ms,
+        "stdev_ms": (statistics.stdev(ordered) if len(ordered) > 1 else 0.0) * to_ms,
+        "samples_ms": [sample * to_ms for sample in samples],
+    }
+
+
+def run_case(driver, case, iterations, warmup):
+    """
+    Times one case over the given number of iterations.
+
+    Parameters:
+    - driver: The WebDriver instance with the primitives fixture opened.
+    - case: The BenchmarkCase to run.
+    - iterations: Number of timed iterations.
+    - warmup: Number of untimed iterations executed first.
+
+    Returns:
+    - dict: Summary statistics for the case.
+    """
+    page = BasePage(driver)
+    samples = []
+    for iteration in range(warmup + iterations):
+        driver.execute_script("window.benchReset(arguments[0]);", {"delay": case.delay_ms})
+        started = time.perf_counter()
+        case.action(page)
+        elapsed = time.perf_counter() - started
+        if iteration >= warmup:
+            samples.append(elapsed)
+    result = summarize(samples)
+    result["delay_ms"] = case.delay_ms
+    return result
+
+
+def run_browser(browser, cases, iterations, warmup, server, fast_path=False, disable_animations=False):
+    """
+    Runs the selected cases in one headless browser.
+
+    Parameters:
+    - browser: Browser name, a key of BROWSERS.
+    - cases: The BenchmarkCase instances to run.
+    - iterations: Number of timed iterations per case.
+    - warmup: Number of untimed iterations per case.
+    - server: The running FixtureServer.
+    - fast_path: Whether to open the CDP/BiDi fast path next to the session.
+    - disable_animations: Whether to disable transitions and animations in the fixture pages.
+
+    Returns:
+    - dict: Results keyed by case name; skipped cases map to a 'skipped' reason.
+    """
+    driver_id = BROWSERS[browser]
+    driver = create_driver_factory(driver_id, options=create_driver_options(driver_id, headless=True),
+                                   fast_path=fast_path, disable_animations=disable_animations)
+    results = {}
+    try:
+        driver.set_window_size(1280, 900)
+        driver.get(server.url("primitives.html"))
+        has_select2 = driver.execute_script("return !!(window.jQuery && jQuery.fn.select2);")
+        for case in cases:
+            if case.requires_select2 and not has_select2:
+                results[case.name] = {"skipped": "select2 could not be loaded"}
+                continue
+            print(f"[{browser}] {case.name} ...", file=sys.stderr)
+            results[case.name] = run_case(driver, case, iterations, warmup)
+    finally:
+        close_fast_path(driver)
+        driver.quit()
+    return results
+
+
+def run(args):
+    cases = [case for case in CASES if not args.cases or case.name in args.cases]
+    unknown = set(args.cases or []) - {case.name for case in CASES}
+    if unknown:
+        raise SystemExit(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    BasePage.wait_engine = args.wait_engine
+    commit = current_commit() or "unknown"
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    report = {
+        "commit": commit,
+        "started_at": started_at.isoformat(),
+        "python": platform.python_version(),
+        "selenium": selenium.__version__,
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "wait_engine": args.wait_engine,
+        "fast_path": args.fast_path,
+        "disable_animations": args.disable_animations,
+        "results": {},
+    }
+    with FixtureServer() as server:
+        for browser in args.browsers:
+            report["results"][browser] = run_browser(browser, cases, args.iterations, args.warmup, server,
+                                                     args.fast_path, args.disable_animations)
+    for line in click_retry_stats.summary():
+        print(line, file=sys.stderr)
+
+    output = Path(args.output) if args.output else _results_path.joinpath(
+        f"{started_at:%Y%m%dT%H%M%S}-{commit}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(output)
+
+
+def compare(args):
+    old = json.loads(Path(args.old).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    if old.get("wait_engine") != new.get("wait_engine"):
+        print(f"wait engine: {old.get('wait_engine')} -> {new.get('wait_engine')}")
+    if old.get("disable_animations") != new.get("disable_animations"):
+        print(f"animations disabled: {old.get('disable_animations')} -> {new.get('disable_animations')}")
+    print(f"{'browser':<8} {'case':<46} {old['commit']:>10} {new['commit']:>10} {'delta':>8}")
+    for browser, cases in new["results"].items():
+        for name, result in cases.items():
+            previous = old["results"].get(browser, {}).get(name)
+            if not previous or "median_ms" not in previous or "median_ms" not in result:
+                continue
+            delta = (result["median_ms"] - previous["median_ms"]) / previous["median_ms"] * 100
+            print(f"{browser:<8} {name:<46} {previous['median_ms']:>8.1f}ms {result['median_ms']:>8.1f}ms "
+                  f"{delta:>+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and save the results as JSON")
+    run_parser.add_argument("--browsers", nargs="+", choices=sorted(BROWSERS), default=["chrome", "firefox"])
+    run_parser.add_argument("--cases", nargs="+", help="only run the named cases")
+    run_parser.add_argument("--iterations", type=int, default=30)
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--wait-engine", choices=sorted(WAIT_ENGINES), default=BasePage.wait_engine)
+    run_parser.add_argument("--fast-path", action="store_true", help="route hot reads/waits over CDP/BiDi")
+    run_parser.add_argument("--disable-animations", action="store_true",
+                            help="disable transitions and animations in the fixture pages")
+    run_parser.add_argument("--output", help="result file (default: benchmarks/results/<time>-<commit>.json)")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare the medians of two result files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,20 @@
+import datetime
 import json
 import os
+import sys
+import time
 from contextlib import suppress
 from pathlib import Path
 
 import allure
 import pytest
-from selenium.webdriver.chrome.options import Options
 
-from utilities.driver_factory import create_driver_factory
+from utilities.driver_factory import close_fast_path, create_driver_factory, create_driver_options
+from utilities.ui_utilities.wait_budget import wait_budget
 
 _screenshot_path = Path.home().joinpath("Downloads")
+_network_log_path = Path(__file__).parent.joinpath("network-logs",
+                                                  f"{datetime.datetime.now():%Y%m%dT%H%M%S}.jsonl")
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -63,14 +68,114 @@ def pytest_runtest_makereport(item, call):
     return rep
 
 
-def create_driver_for_page(request, env, page_url):
+def pytest_terminal_summary(terminalreporter):
+    """
+        Reports the time spent retrying intercepted clicks, per animation suppression mode.
+
+        Parameters:
+        - terminalreporter: The terminal reporter plugin.
+
+        Note:
+        - Nothing is reported if no test went through 'wait_for_element_clickable_and_click'
+          (or Selenium was never imported).
+        """
+    animations = sys.modules.get("utilities.ui_utilities.animations")
+    if animations is None or not animations.click_retry_stats.totals:
+        return
+    terminalreporter.section("click retries")
+    for line in animations.click_retry_stats.summary():
+        terminalreporter.write_line(line)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def adaptive_timeouts(env):
+    """
+        Fixture enabling adaptive per-locator timeouts for the session when the 'adaptive_timeouts' env option is on.
+
+        Every element wait is recorded to 'wait-history/history.json'; locators with enough history wait for
+        p99 x safety factor of their earlier durations instead of the fixed timeout.
+
+        Yields:
+        - TimeoutHistory or None: The active history.
+
+        Note:
+        - The history is saved at the end of the session, merged with runs that finished meanwhile.
+        - Review the learned table with 'python -m utilities.ui_utilities.adaptive_timeouts'.
+        """
+    if not env.get("adaptive_timeouts"):
+        yield None
+        return
+    from utilities.ui_utilities.adaptive_timeouts import TimeoutHistory, use_timeout_history
+
+    history = TimeoutHistory.load()
+    with use_timeout_history(history):
+        yield history
+    history.save()
+
+
+@pytest.fixture(scope="session")
+def results_recorder(env):
+    """
+        Fixture recording the test attempts and page-object steps of the tests that use a driver to the results
+        store ('results/results.sqlite') when the 'results_store' env option is on.
+
+        Yields:
+        - ResultsRecorder or None: The recorder.
+
+        Note:
+        - Requested by 'create_driver_for_page' only, so tests without a browser (e.g. the unit tests) neither
+          open the store nor add a run to it.
+        - Query the store with 'python -m utilities.results_store'.
+        """
+    if not env.get("results_store"):
+        yield None
+        return
+    from utilities.results_store import ResultsRecorder, ResultsStore
+
+    recorder = ResultsRecorder(ResultsStore(), label=f"browser_id={env['browser_id']}").start()
+    yield recorder
+    recorder.stop()
+    recorder.store.close()
+
+
+@pytest.fixture(autouse=True)
+def active_wait_budget(request, env):
+    """
+        Fixture activating a per-test wait budget shared by every element wait of the test.
+
+        The budget in seconds comes from the 'wait_budget' marker (e.g. @pytest.mark.wait_budget(90)) or,
+        if the test has no marker, from the 'wait_budget' env option. Without either, waits keep their own
+        timeouts.
+
+        Yields:
+        - WaitBudget or None: The active budget.
+
+        Note:
+        - When the budget runs out the test fails with WaitBudgetExceeded and a breakdown of the waits.
+        - If the test fails, the breakdown is attached to the Allure report.
+        """
+    marker = request.node.get_closest_marker("wait_budget")
+    total = marker.args[0] if marker else env.get("wait_budget")
+    if not total:
+        yield None
+        return
+    with wait_budget(total) as budget:
+        yield budget
+    rep_call = getattr(request.node, "rep_call", None)
+    if rep_call and rep_call.failed:
+        allure.attach(budget.breakdown(), name="wait budget", attachment_type=allure.attachment_type.TEXT)
+
+
+def create_driver_for_page(request, env, page_url, prepare=None):
     """
        Fixture for creating a WebDriver instance, navigating to a page, and maximizing the window.
 
        Parameters:
        - request: The pytest request object.
        - env: The environment configuration.
-       - page_url: The URL of the page to navigate to.
+       - page_url: The URL of the page to navigate to; not loaded when 'prepare' is given.
+       - prepare: Optional callable receiving the driver once the window is maximized, to bring the browser to
+         the state the test starts from (including opening the first page).
 
        Yields:
        - WebDriver instance.
@@ -78,6 +183,15 @@ def create_driver_for_page(request, env, page_url):
        Note:
        - The fixture is designed to be used with pytest.
        - It supports an optional marker 'headless' to run the browser in headless mode.
+       - The 'wait_engine' env option ('polling' or 'observer') selects how page objects wait for elements.
+       - The 'select2_fast_mode' env option makes select2 dropdowns select through the widget API.
+       - The 'fast_path' env option opens a CDP/BiDi websocket used for hot read and wait commands.
+       - The 'disable_animations' env option turns off CSS transitions/animations, smooth scrolling and jQuery
+         animations in every page, so clicks are no longer intercepted by elements still sliding or fading.
+       - The 'network_capture' env option records the network requests of every page-object step: a waterfall
+         is attached to each step in the Allure report and all requests go to 'network-logs/<run>.jsonl'.
+       - The 'results_store' env option appends the outcome, duration, wait time, command count and steps of the
+         test to the results store.
        - The WebDriver instance is yielded to the test function.
        - The fixture ensures that the browser window is maximized.
        - If the associated test fails, a screenshot is attached to the Allure report.
@@ -87,22 +201,57 @@ def create_driver_for_page(request, env, page_url):
        other create_driver fixtures/
        - Use the yielded 'driver' instance to interact with the web page.
        """
-    driver_options = Options()
-    is_headless = request.node.get_closest_marker("headless")
-    if is_headless:
-        driver_options.add_argument("--headless")
+    # Imported here rather than at module level to keep test collection from loading Selenium.
+    from utilities.ui_utilities.base_page import BasePage
+    from utilities.ui_utilities.select2 import Select2
 
     env = dict(env)
-    driver = create_driver_factory(env["browser_id"], options=driver_options)
-    driver.get(page_url)
-    driver.maximize_window()
-    yield driver
-    if request.node.rep_call.failed:
-        with suppress(Exception):
-            allure.attach(driver.get_screenshot_as_png(),
-                          name=request.function.__name__,
-                          attachment_type=allure.attachment_type.PNG)
-    driver.quit()
+    is_headless = request.node.get_closest_marker("headless")
+    network_capture = env.get("network_capture", False)
+    driver_options = create_driver_options(env["browser_id"], headless=bool(is_headless),
+                                           network_capture=network_capture)
+    BasePage.wait_engine = env.get("wait_engine", BasePage.wait_engine)
+    Select2.fast_mode = env.get("select2_fast_mode", Select2.fast_mode)
+    driver = create_driver_factory(env["browser_id"], options=driver_options, fast_path=env.get("fast_path", False),
+                                   disable_animations=env.get("disable_animations", False))
+    recorder = request.getfixturevalue("results_recorder")
+    started = time.monotonic()
+    capture = None
+    try:
+        if recorder is not None:
+            recorder.watch(driver)
+            recorder.start_test(request.node.nodeid)
+        if network_capture:
+            from utilities.network_capture import NetworkCapture
+
+            capture = NetworkCapture(driver, log_path=_network_log_path, test_name=request.node.nodeid).start()
+        try:
+            if prepare is None:
+                driver.get(page_url)
+            driver.maximize_window()
+            if prepare is not None:
+                prepare(driver)
+        except BaseException:
+            if recorder is not None:
+                recorder.finish_test("failed", time.monotonic() - started)
+            raise
+        yield driver
+        if recorder is not None:
+            rep_call = request.node.rep_call
+            recorder.finish_test("failed" if rep_call.failed else "skipped" if rep_call.skipped else "passed",
+                                 rep_call.duration)
+        if request.node.rep_call.failed:
+            with suppress(Exception):
+                allure.attach(driver.get_screenshot_as_png(),
+                              name=request.function.__name__,
+                              attachment_type=allure.attachment_type.PNG)
+    finally:
+        # Also runs when the setup above fails, so a failing (and rerun) setup does not leak the browser.
+        if capture is not None:
+            with suppress(Exception):
+                capture.stop()
+        close_fast_path(driver)
+        driver.quit()
 
 
 @pytest.fixture
@@ -131,3 +280,70 @@ def create_driver_product_cart(request, env):
             # Test logic using the 'driver' instance for the product cart page.
         """
     yield from create_driver_for_page(request, env, env["app_url"])
+
+
+@pytest.fixture(scope="session")
+def checkpoints(env):
+    """
+        Fixture providing the browser-state checkpoints shared by the tests of the session (and later runs).
+
+        Parameters:
+        - env: The environment configuration; 'checkpoint_ttl' sets how many seconds a checkpoint may be
+          restored for (keep it below the server-side cart lifetime).
+
+        Returns:
+        - CheckpointStore: The checkpoint store.
+        """
+    from utilities.browser_state import CheckpointStore
+
+    return CheckpointStore(ttl=env.get("checkpoint_ttl", 900))
+
+
+def _open_checkout_with_product(driver, env):
+    from page_objects.main_page_pack.main_page import MainPage
+
+    driver.get(env["app_url"])
+    main_page = MainPage(driver)
+    results = main_page.search("шуруп").get_search_results()
+    main_page.open_search_result(results.by_id("17717")).set_quantity("5").click_buy_product().click_make_order()
+
+
+@pytest.fixture
+def create_driver_checkout(request, env, checkpoints):
+    """
+        Fixture for creating a WebDriver instance on the checkout page with a product in the cart.
+
+        Parameters:
+        - request: The pytest request object.
+        - env: The environment configuration.
+        - checkpoints: The session's CheckpointStore.
+
+        Yields:
+        - WebDriver instance on the checkout page.
+
+        Note:
+        - The search, product page, quantity and add-to-cart prefix runs once; its cookies, localStorage,
+          sessionStorage and URL are saved as the 'checkout-with-product' checkpoint and restored into the
+          fresh driver of every later test, until the checkpoint expires or stops opening the checkout page.
+
+        Example:
+        @pytest.mark.parametrize("town_name", ["Київ", "Львів"])
+        def test_checkout(create_driver_checkout, town_name):
+            CheckoutPage(create_driver_checkout).set_town(town_name).select_town_option()
+        """
+    from page_objects.checkout_page_pack.checkout_page import CheckoutPage
+    from utilities.ui_utilities.wait_budget import WaitBudgetExceeded
+
+    def is_checkout_opened(driver):
+        # A stale checkpoint should cost seconds, not the 60 s default wait, before the prefix is replayed.
+        try:
+            with wait_budget(15):
+                return CheckoutPage(driver).is_checkout_page_opened()
+        except WaitBudgetExceeded:
+            return False
+
+    def prepare(driver):
+        checkpoints.fork(driver, "checkout-with-product",
+                         build=lambda driver: _open_checkout_with_product(driver, env), validate=is_checkout_opened)
+
+    yield from create_driver_for_page(request, env, None, prepare)
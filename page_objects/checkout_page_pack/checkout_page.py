@@ -1,9 +1,8 @@
-import time
-
 from selenium.webdriver.common.by import By
 
 from utilities.auto_step.auto_step import autostep
 from utilities.ui_utilities.base_page import BasePage
+from utilities.ui_utilities.select2 import Select2
 
 
 @autostep
@@ -32,13 +31,10 @@ class CheckoutPage(BasePage):
     __telephone_input = (By.XPATH, "//input[@name='telephone']")
     __email_input = (By.XPATH, "//input[@name='username-custom']")
     __town_select = (By.XPATH, "(//span[@class='select2-selection select2-selection--single']) [1]")
-    __select_input = (By.XPATH, "(//input[@class='select2-search__field'])")
-    __select_option = (By.XPATH, '//li[text()="Київ"]')
     __delivery_method_select = (
         By.XPATH, "(//span[@class='select2-selection select2-selection--single']) [2]")
     __delivery_method_option = (By.XPATH, "//li[@class='s_method_novaposhta_novaposhta_to_warehouse']")
     __issuing_office_select = (By.XPATH, "(//span[@class='select2-selection select2-selection--single']) [3]")
-    __select_issuing_office_option = (By.XPATH, '//li[text()="Відділення №180 (до 30 кг): просп. Степана Бандери, 8"]')
     __payment_method_select = (
         By.XPATH, "//span[@class='select2-selection__placeholder' and text()='Готівкою при отриманні']")
     __add_comment = (By.XPATH, "//span[@id='add-comment' and @class='toggle']")
@@ -52,6 +48,10 @@ class CheckoutPage(BasePage):
         - driver: The WebDriver instance for interacting with the web page.
         """
         super().__init__(driver)
+        self.__town = Select2(driver, self.__town_select)
+        self.__delivery_method = Select2(driver, self.__delivery_method_select)
+        self.__issuing_office = Select2(driver, self.__issuing_office_select)
+        self.__town_search_text = None
 
     def is_checkout_page_opened(self):
         """
@@ -103,20 +103,42 @@ class CheckoutPage(BasePage):
         Returns:
         - self: The current instance for method chaining.
         """
-
-        self.wait_for_element_clickable_and_click(self.__town_select)
-        self.send_keys(self.__select_input, text)
+        self.__town_search_text = text
+        if not Select2.fast_mode:
+            self.__town.open().search(text)
         return self
 
-    def select_town_option(self):
+    def select_town_option(self, text=None):
         """
         Selects the town option in the checkout form.
 
+        Parameters:
+        - text: The exact name of the town option (default is the text passed to 'set_town').
+
         Returns:
          - self: The current instance for method chaining.
+
+        Raises:
+        - ValueError: If no text is given and 'set_town' was not called before.
+        """
+        if not text:
+            if self.__town_search_text is None:
+                raise ValueError("select_town_option() needs the town name when set_town() was not called first")
+            text = self.__town_search_text.strip()
+        if Select2.fast_mode:
+            self.__town.select_by_text(text, exact=True)
+        else:
+            self.__town.choose(text, exact=True)
+        return self
+
+    def open_delivery_method(self):
         """
+        Opens the delivery method dropdown in the checkout form.
 
-        self.wait_for_element_clickable_and_click(self.__select_option)
+        Returns:
+        - self: The current instance for method chaining.
+        """
+        self.__delivery_method.open()
         return self
 
     def set_delivery_method(self):
@@ -126,7 +148,7 @@ class CheckoutPage(BasePage):
         Returns:
         - self: The current instance for method chaining.
         """
-        self.wait_for_element_clickable_and_click(self.__delivery_method_select)
+        self.open_delivery_method()
         self.scroll_via_js()
         self.wait_for_element_clickable_and_click(self.__delivery_method_option)
         return self
@@ -136,21 +158,12 @@ class CheckoutPage(BasePage):
         Sets the issuing office in the checkout form.
 
         Parameters:
-        - text: The name of the issuing office to be set.
+        - text: The name (or the beginning of the name) of the issuing office to be set.
 
         Returns:
         - self: The current instance for method chaining.
         """
-        # wait for results shown
-        time.sleep(3)
-        self.wait_for_element_clickable_and_click(self.__issuing_office_select)
-        self.send_keys(self.__select_input, text)
-        # wait for results shown
-        time.sleep(3)
-        self.press_backspace()
-        # wait for results shown
-        time.sleep(3)
-        self.wait_for_element_clickable_and_click(self.__select_issuing_office_option)
+        self.__issuing_office.select_by_text(text)
         return self
 
     def check_payment_method(self):
@@ -1,8 +1,10 @@
+from selenium.common import JavascriptException
 from selenium.webdriver.common.by import By
 
+from page_objects.main_page_pack.search_results import EXTRACT_SEARCH_RESULTS_SCRIPT, SearchResults
 from utilities.auto_step.auto_step import autostep
-from page_objects.product_page_pack.product_page import ProductPage
 from utilities.ui_utilities.base_page import BasePage
+from utilities.ui_utilities.wait_engines import run_async_script
 
 
 @autostep
@@ -17,7 +19,8 @@ class MainPage(BasePage):
 
        Example:
        main_page = MainPage(driver)
-       main_page.set_search_text("water pump").click_search_result()
+       results = main_page.search("шуруп").get_search_results()
+       product_page = main_page.open_search_result(results.by_id("17717"))
        """
     def __init__(self, driver):
         """
@@ -29,8 +32,10 @@ class MainPage(BasePage):
         super().__init__(driver)
 
     __input_search = (By.XPATH, "//input[@id='search' and @name='q' ]")
-    __search_result_locator = (By.XPATH,
-                               "//a[@rel='noreferrer' and @href='https://aquapolis.ua/ua/komplekt-vintov-aquant-dlja-prozhektora-08020101-0006-malenkie.html']")
+    # 'search' marks the document it was typed on, so the listing is only found once the results page replaced it.
+    __search_results_listing = (By.XPATH, "/html[not(@data-before-search)]//ol[contains(@class, 'product-items')] | "
+                                          "/html[not(@data-before-search)]"
+                                          "//div[contains(@class, 'message') and contains(@class, 'notice')]")
 
     def set_search_text(self, text):
         """
@@ -45,12 +50,63 @@ class MainPage(BasePage):
         self.send_keys(self.__input_search, text)
         return self
 
-    def click_search_result(self):
+    def search(self, text):
         """
-         Clicks on a specific search result link.
+        Enters the specified text into the search input field and submits the search.
+
+        Parameters:
+        - text: The text to search for.
+
+        Returns:
+        - self: The current instance for method chaining.
+        """
+        self._driver.execute_script("document.documentElement.setAttribute('data-before-search', '');")
+        self.set_search_text(text).press_enter()
+        return self
+
+    def get_search_results(self):
+        """
+        Extracts the whole search-results listing in one script call.
+
+        After 'search' the listing is only looked for in a document other than the one the search was typed on,
+        so the listing of that page (e.g. featured products) is not taken for the results. The wait goes
+        through the shared element wait (wait budget, learned timeouts, wait listeners).
+        Further result pages are fetched in the background only when a lookup needs them, so the browser
+        stays on the current page.
+
+        Returns:
+        - SearchResults: The results indexed by product id and name.
+        """
+        self.get_present_element(self.__search_results_listing)
+        page = self._driver.execute_script(EXTRACT_SEARCH_RESULTS_SCRIPT, None)
+        return SearchResults(page["items"], page["next_url"], self.__load_search_results_page)
+
+    def __load_search_results_page(self, url):
+        """
+        Fetches and extracts another search-results page without navigating.
+
+        Parameters:
+        - url: The URL of the results page.
+
+        Returns:
+        - tuple: The result dicts of the page and the URL of the page after it (or None).
+        """
+        page = run_async_script(self._driver, 30, EXTRACT_SEARCH_RESULTS_SCRIPT, url)
+        if "error" in page:
+            raise JavascriptException(f"Could not load search results page {url}: {page['error']}")
+        return page["items"], page["next_url"]
+
+    def open_search_result(self, result):
+        """
+        Navigates straight to the product page of a search result.
+
+        Parameters:
+        - result: A SearchResult, e.g. from 'get_search_results().by_id(...)'.
 
         Returns:
         - ProductPage: An instance of the 'ProductPage' class for further interaction.
         """
-        self.click(self.__search_result_locator)
+        from page_objects.product_page_pack.product_page import ProductPage
+
+        self._driver.get(result.url)
         return ProductPage(self._driver)
@@ -0,0 +1,181 @@
+# Extracts every product of a search-results listing in one call. Runs either against the current document
+# (execute_script) or against the HTML of another results page fetched in the background (execute_async_script),
+# so paginating never navigates the browser away.
+# arguments: next page URL or null, [callback]
+EXTRACT_SEARCH_RESULTS_SCRIPT = r"""
+function extract(doc, baseUrl) {
+    var items = doc.querySelectorAll("ol.product-items > li.product-item, .products-grid .product-item");
+    var results = Array.prototype.map.call(items, function (item) {
+        var link = item.querySelector("a.product-item-link") || item.querySelector("a.product-item-photo");
+        var idHolder = item.querySelector("[data-product-id]");
+        var idInput = item.querySelector("input[name='product']");
+        var price = item.querySelector("[data-price-type='finalPrice'][data-price-amount]");
+        return {
+            product_id: idHolder ? idHolder.getAttribute("data-product-id") : (idInput ? idInput.value : null),
+            name: link ? link.textContent.trim() : "",
+            url: link ? new URL(link.getAttribute("href"), baseUrl).href : null,
+            price: price ? Number(price.getAttribute("data-price-amount")) : null,
+            in_stock: !item.querySelector(".stock.unavailable, .out-of-stock")
+        };
+    });
+    var next = doc.querySelector(".pages-item-next a");
+    return {items: results, next_url: next ? new URL(next.getAttribute("href"), baseUrl).href : null};
+}
+
+var url = arguments[0];
+if (url === null) {
+    return extract(document, document.baseURI);
+}
+var done = arguments[arguments.length - 1];
+fetch(url, {credentials: "include"})
+    .then(function (response) { return response.text(); })
+    .then(function (html) { done(extract(new DOMParser().parseFromString(html, "text/html"), url)); })
+    .catch(function (error) { done({error: String(error)}); });
+"""
+
+
+class SearchResult:
+    """
+    A single product of the search-results listing.
+
+    Attributes:
+    - product_id: The catalog product id (str), or None if the listing does not expose it.
+    - name: The product name as shown in the listing.
+    - url: The product page URL.
+    - price: The final price as a number, or None.
+    - in_stock: Whether the product is shown as available.
+    """
+
+    def __init__(self, product_id, name, url, price, in_stock):
+        self.product_id = product_id
+        self.name = name
+        self.url = url
+        self.price = price
+        self.in_stock = in_stock
+
+    def __repr__(self):
+        return f"SearchResult(product_id={self.product_id!r}, name={self.name!r}, price={self.price!r})"
+
+
+class SearchResults:
+    """
+    Indexed search-results listing.
+
+    Results are indexed by product id and by name, so picking one is a dictionary lookup. Further pages are
+    only loaded when a lookup misses or the iteration reaches the end of the pages loaded so far.
+
+    Attributes:
+    - next_url: URL of the first page not loaded yet, or None when all pages are loaded.
+
+    Example:
+    results = main_page.search("шуруп").get_search_results()
+    product_page = main_page.open_search_result(results.by_id("17717"))
+    cheapest = min(results, key=lambda result: result.price)
+    """
+
+    def __init__(self, items, next_url, load_page):
+        """
+        Initializes the SearchResults instance.
+
+        Parameters:
+        - items: Dicts of the first page as returned by EXTRACT_SEARCH_RESULTS_SCRIPT.
+        - next_url: URL of the next results page, or None.
+        - load_page: Callable returning (items, next_url) for a page URL.
+        """
+        self.next_url = next_url
+        self.__load_page = load_page
+        self.__results = []
+        self.__by_id = {}
+        self.__by_name = {}
+        self.__add(items)
+
+    def __add(self, items):
+        for item in items:
+            result = SearchResult(**item)
+            self.__results.append(result)
+            if result.product_id is not None:
+                self.__by_id.setdefault(str(result.product_id), result)
+            self.__by_name.setdefault(result.name.casefold(), result)
+
+    def __load_next_page(self):
+        """
+        Loads the next page into the index.
+
+        Returns:
+        - bool: False if there was no page left to load.
+        """
+        if self.next_url is None:
+            return False
+        items, self.next_url = self.__load_page(self.next_url)
+        self.__add(items)
+        return True
+
+    def __lookup(self, index, key):
+        while key not in index:
+            if not self.__load_next_page():
+                raise LookupError(f"No search result {key!r} on any of the loaded pages")
+        return index[key]
+
+    def by_id(self, product_id):
+        """
+        Finds a result by its product id, loading further pages only if needed.
+
+        Parameters:
+        - product_id: The product id.
+
+        Returns:
+        - SearchResult: The matching result.
+
+        Raises:
+        - LookupError: If no page contains the product.
+        """
+        return self.__lookup(self.__by_id, str(product_id))
+
+    def by_name(self, name):
+        """
+        Finds a result by its exact name (case-insensitive), loading further pages only if needed.
+
+        Parameters:
+        - name: The product name.
+
+        Returns:
+        - SearchResult: The matching result.
+
+        Raises:
+        - LookupError: If no page contains the product.
+        """
+        return self.__lookup(self.__by_name, name.strip().casefold())
+
+    def find(self, predicate):
+        """
+        Finds the first result matching the predicate, loading further pages only if needed.
+
+        Parameters:
+        - predicate: Callable receiving a SearchResult.
+
+        Returns:
+        - SearchResult: The first matching result.
+
+        Raises:
+        - LookupError: If no result matches.
+        """
+        for result in self:
+            if predicate(result):
+                return result
+        raise LookupError("No search result matches the predicate")
+
+    def loaded(self):
+        """
+        Returns:
+        - List[SearchResult]: The results of the pages loaded so far, without loading more.
+        """
+        return list(self.__results)
+
+    def __iter__(self):
+        position = 0
+        while True:
+            while position < len(self.__results):
+                yield self.__results[position]
+                position += 1
+            if not self.__load_next_page():
+                return
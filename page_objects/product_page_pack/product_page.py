@@ -1,7 +1,6 @@
 from selenium.webdriver.common.by import By
 
 from utilities.auto_step.auto_step import autostep
-from page_objects.checkout_page_pack.checkout_page import CheckoutPage
 from utilities.ui_utilities.base_page import BasePage
 
 
@@ -114,5 +113,7 @@ class ProductPage(BasePage):
          Returns:
         - CheckoutPage: An instance of the CheckoutPage class representing the checkout page.
         """
+        from page_objects.checkout_page_pack.checkout_page import CheckoutPage
+
         self.click(self.__minicart_make_an_order_button)
         return CheckoutPage(self._driver)
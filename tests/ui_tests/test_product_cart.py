@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import allure
+import pytest
 from flaky import flaky
+from page_objects.checkout_page_pack.checkout_page import CheckoutPage
 from page_objects.main_page_pack.main_page import MainPage
 
 
@@ -18,7 +20,7 @@ def test_adding_product_to_cart_valid_data(create_driver_product_cart, env):
 
     This test performs the following steps:
     1. Searches for a product using the specified keyword.
-    2. Clicks on the search result.
+    2. Opens product 17717 from the search results.
     3. Verifies that the product is ready to dispatch.
     4. Sets the quantity of the product and adds it to the cart.
     5. Verifies that the minicart window is open and the quantity and price matches the entered value.
@@ -39,7 +41,9 @@ def test_adding_product_to_cart_valid_data(create_driver_product_cart, env):
 
     # Step 1: Search for a product
     search_keyword = "шуруп"
-    product_case = MainPage(driver).set_search_text(search_keyword).click_search_result()
+    main_page = MainPage(driver)
+    results = main_page.search(search_keyword).get_search_results()
+    product_case = main_page.open_search_result(results.by_id("17717"))
 
     # Step 2: Verify product status
     assert product_case.verify_product_status_is_ready_to_dispatch(), "Product is not ready to dispatch or element not found!"
@@ -78,3 +82,35 @@ def test_adding_product_to_cart_valid_data(create_driver_product_cart, env):
     # The test case does not specify what needs to be verified for order checkout in reality(at te end),
     # so I am simply checking if the page is open.
     assert checkout_page.is_checkout_page_opened(), "Checkout page isn't shown"
+
+
+@allure.feature('Product Cart Feature')
+@flaky(max_runs=3, min_passes=1)
+@pytest.mark.parametrize("town_name, comment", [
+    ('Київ', 'Test order'),
+    ('Львів', 'Call before delivery'),
+])
+def test_checkout_variants_valid_data(create_driver_checkout, env, town_name, comment):
+    """
+    Test case to validate checkout variants for a product already in the cart.
+
+    The search, product page, quantity and add-to-cart prefix is restored from the 'checkout-with-product'
+    checkpoint (see the 'create_driver_checkout' fixture), so every variant starts on the checkout page.
+
+    Parameters:
+    - create_driver_checkout: Pytest fixture to create a WebDriver on the checkout page.
+    - env: Pytest fixture providing environment configuration data.
+    - town_name: The town to deliver to.
+    - comment: The order comment.
+
+    Expected result:
+    - The checkout form accepts the variant.
+    """
+    checkout_page = CheckoutPage(create_driver_checkout)
+    assert checkout_page.is_checkout_page_opened(), "Checkout page isn't shown"
+
+    checkout_page.set_user_creds(env["valid_name"], env["valid_surname"], env["valid_phone_number"],
+                                 env["valid_email"])
+    checkout_page.set_town(town_name).select_town_option().set_delivery_method().check_payment_method()
+    checkout_page.click_add_comment().set_comment(comment)
+    assert checkout_page.is_checkout_page_opened(), "Checkout page isn't shown"
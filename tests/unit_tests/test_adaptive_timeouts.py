@@ -0,0 +1,87 @@
+from unittest import mock
+
+import pytest
+from selenium.common import TimeoutException
+from selenium.webdriver.common.by import By
+
+from utilities.ui_utilities.adaptive_timeouts import TimeoutHistory, percentile, use_timeout_history
+from utilities.ui_utilities.base_page import BasePage
+from utilities.ui_utilities.wait_budget import wait_budget
+
+LOCATOR = (By.XPATH, "//li[@class='s_method_novaposhta_novaposhta_to_warehouse']")
+
+
+def _history(path, durations, page="CheckoutPage", condition="clickable", locator=LOCATOR):
+    history = TimeoutHistory(path)
+    for duration in durations:
+        history.record(page, condition, locator, duration, "ok")
+    return history
+
+
+def test_percentile_uses_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 0.99) == 99
+    assert percentile(samples, 0.5) == 50
+    assert percentile([7], 0.99) == 7
+
+
+def test_nothing_is_learned_below_min_samples(tmp_path):
+    assert _history(tmp_path / "history.json", [0.2] * 19).learned("CheckoutPage", "clickable", LOCATOR) is None
+
+
+def test_learned_timeout_and_poll_are_clamped(tmp_path):
+    fast = _history(tmp_path / "history.json", [0.2] * 20)
+    assert fast.learned("CheckoutPage", "clickable", LOCATOR) == (2.0, pytest.approx(0.05))
+    slow = _history(tmp_path / "history.json", [5.0] * 19 + [12.0])
+    assert slow.learned("CheckoutPage", "clickable", LOCATOR) == (36.0, 0.5)
+    stuck = _history(tmp_path / "history.json", [30.0] * 20)
+    assert stuck.learned("CheckoutPage", "clickable", LOCATOR)[0] == 60.0
+
+
+def test_save_merges_runs_and_keeps_recent_samples(tmp_path):
+    path = tmp_path / "history.json"
+    first, second = TimeoutHistory.load(path), TimeoutHistory.load(path)
+    first.max_samples = second.max_samples = 3
+    first.record("MainPage", "visible", LOCATOR, 1.0, "ok")
+    second.record("MainPage", "visible", LOCATOR, 2.0, "ok")
+    second.record("MainPage", "visible", LOCATOR, 3.0, "timeout")
+    first.save()
+    second.save()
+    third = TimeoutHistory.load(path)
+    third.max_samples = 3
+    third.record("MainPage", "visible", LOCATOR, 4.0, "ok")
+    third.save()
+    [(entry, _)] = TimeoutHistory.load(path).table()
+    assert entry.durations == [2.0, 3.0, 4.0]
+    assert entry.timeouts == 1
+
+
+def test_page_waits_use_learned_timeout_within_budget(tmp_path):
+    page = BasePage(mock.Mock())
+    page._wait_engine = mock.Mock()
+    history = _history(tmp_path / "history.json", [1.0] * 20, page="BasePage")
+    with use_timeout_history(history), wait_budget(10):
+        page.click(LOCATOR)
+    page._wait_engine.until.assert_called_once_with("clickable", LOCATOR, timeout=3.0, poll=0.2)
+    assert len(history.table()[0][0].durations) == 21
+
+
+def test_explicit_timeout_wins_over_learned_one(tmp_path):
+    page = BasePage(mock.Mock())
+    page._wait_engine = mock.Mock()
+    history = _history(tmp_path / "history.json", [1.0] * 20, page="BasePage", condition="invisible")
+    with use_timeout_history(history):
+        page.is_not_displayed(LOCATOR, timeout=25)
+        page.is_not_displayed(LOCATOR)
+    assert page._wait_engine.until.call_args_list == [mock.call("invisible", LOCATOR, timeout=25, poll=None),
+                                                      mock.call("invisible", LOCATOR, timeout=3.0, poll=0.2)]
+
+
+def test_click_via_js_reports_the_timeout_waited(tmp_path):
+    driver = mock.Mock()
+    driver.find_element.return_value.is_displayed.return_value = False
+    page = BasePage(driver)
+    page._wait_engine.poll_interval = 0.01
+    history = _history(tmp_path / "history.json", [0.01] * 20, page="BasePage")
+    with use_timeout_history(history), pytest.raises(TimeoutException, match="clickable within 2.0 seconds"):
+        page.click_via_js(LOCATOR)
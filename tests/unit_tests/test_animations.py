@@ -0,0 +1,65 @@
+from unittest import mock
+
+import pytest
+from selenium.common import ElementClickInterceptedException
+from selenium.webdriver.common.by import By
+
+from utilities.ui_utilities import animations
+from utilities.ui_utilities.animations import INJECTION, PRELOAD, ClickRetryStats, disable_animations
+from utilities.ui_utilities.base_page import BasePage
+
+
+class _FirefoxDriver:
+    """Driver stub without the Chromium-only 'execute_cdp_cmd'."""
+
+    def __init__(self):
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+
+@pytest.fixture
+def stats():
+    fresh = ClickRetryStats()
+    with mock.patch.object(animations, "click_retry_stats", fresh), \
+            mock.patch("utilities.ui_utilities.base_page.click_retry_stats", fresh):
+        yield fresh
+
+
+def test_chromium_registers_preload_script():
+    driver = mock.Mock()
+    assert disable_animations(driver) == PRELOAD
+    driver.execute_cdp_cmd.assert_called_once_with("Page.addScriptToEvaluateOnNewDocument",
+                                                   {"source": animations.DISABLE_ANIMATIONS_SCRIPT})
+    page = BasePage(driver)
+    page._wait_engine = mock.Mock()
+    page.click((By.ID, "plain-button"))
+    driver.execute_script.assert_not_called()
+
+
+def test_without_preload_every_wait_injects_the_script():
+    driver = _FirefoxDriver()
+    assert disable_animations(driver) == INJECTION
+    page = BasePage(driver)
+    assert driver.scripts == []
+    page._wait_engine = mock.Mock()
+    page.click((By.ID, "plain-button"))
+    page.is_displayed((By.ID, "overlay"))
+    assert driver.scripts == [animations.DISABLE_ANIMATIONS_SCRIPT] * 2
+
+
+def test_click_retries_are_recorded_per_mode(stats):
+    driver = mock.Mock()
+    disable_animations(driver)
+    page = BasePage(driver)
+    page._wait_engine = mock.Mock()
+    page._wait_engine.until.return_value.click.side_effect = [ElementClickInterceptedException(), None]
+    with mock.patch("time.sleep"):
+        page.wait_for_element_clickable_and_click((By.ID, "covered-button"))
+    plain = BasePage(mock.Mock())
+    plain._wait_engine = mock.Mock()
+    plain.wait_for_element_clickable_and_click((By.ID, "covered-button"))
+    assert stats.totals[True][:3] == [1, 1, 1]
+    assert stats.totals[False][:3] == [1, 0, 0]
+    assert stats.summary()[0].startswith("click retries (animations enabled): 0 of 1 clicks intercepted")
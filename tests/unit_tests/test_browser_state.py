@@ -0,0 +1,86 @@
+from unittest import mock
+
+import pytest
+from selenium.common import InvalidCookieDomainException
+
+from utilities.browser_state import CheckpointError, CheckpointStore, restore_checkpoint
+
+CHECKOUT_URL = "https://aquapolis.ua/ua/checkout/"
+
+
+class _Driver:
+    """WebDriver stub keeping cookies and storage per driver, redirecting checkout to the cart without a session."""
+
+    def __init__(self, local=None, session=None, cookies=None):
+        self.current_url = "about:blank"
+        self.cookies = list(cookies or [])
+        self.local, self.session = dict(local or {}), dict(session or {})
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        has_session = any(cookie["name"] == "PHPSESSID" for cookie in self.cookies)
+        self.current_url = url if url != CHECKOUT_URL or has_session else "https://aquapolis.ua/ua/checkout/cart/"
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        if cookie.get("domain") == ".google.com":
+            raise InvalidCookieDomainException()
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def execute_script(self, script, *args):
+        if args:
+            self.local, self.session = dict(args[0]), dict(args[1])
+            return None
+        return {"local": dict(self.local), "session": dict(self.session)}
+
+
+def _build(driver):
+    driver.cookies.append({"name": "PHPSESSID", "value": "cart-session", "domain": "aquapolis.ua"})
+    driver.local["mage-cache-storage"] = '{"cart": {"summary_count": 5}}'
+    driver.session["checkout-step"] = "shipping"
+    driver.get(CHECKOUT_URL)
+
+
+def test_fork_builds_once_and_restores_into_a_clean_driver(tmp_path):
+    store = CheckpointStore(tmp_path, ttl=900)
+    build = mock.Mock(side_effect=_build)
+    assert store.fork(_Driver(), "checkout-with-product", build) is False
+
+    clean = _Driver()
+    assert CheckpointStore(tmp_path).fork(clean, "checkout-with-product", build) is True
+    build.assert_called_once()
+    assert clean.visited == ["https://aquapolis.ua/robots.txt", CHECKOUT_URL]
+    assert [cookie["value"] for cookie in clean.cookies] == ["cart-session"]
+    assert clean.local == {"mage-cache-storage": '{"cart": {"summary_count": 5}}'}
+    assert clean.session == {"checkout-step": "shipping"}
+
+
+def test_expired_checkpoint_is_rebuilt(tmp_path):
+    store = CheckpointStore(tmp_path, ttl=900)
+    store.fork(_Driver(), "checkout-with-product", _build)
+    with mock.patch("time.time", return_value=4_000_000_000):
+        assert store.get("checkout-with-product") is None
+    assert not tmp_path.joinpath("checkout-with-product.json").exists()
+
+
+def test_redirect_and_failed_validation_invalidate_the_checkpoint(tmp_path):
+    store = CheckpointStore(tmp_path, ttl=900)
+    checkpoint = store.save(_Driver(cookies=[{"name": "other", "value": "1", "domain": ".google.com"}]), "empty")
+    checkpoint.url = CHECKOUT_URL
+    with pytest.raises(CheckpointError, match="redirected"):
+        restore_checkpoint(_Driver(), checkpoint)
+
+    driver = _Driver()
+    _build(driver)
+    checkpoint = store.save(driver, "checkout-with-product")
+    with pytest.raises(CheckpointError, match="validity check"):
+        restore_checkpoint(_Driver(), checkpoint, validate=lambda driver: False)
+    rebuilt = _Driver()
+    assert store.fork(rebuilt, "checkout-with-product", _build, validate=lambda driver: False) is False
+    assert rebuilt.cookies[0]["value"] == "cart-session"
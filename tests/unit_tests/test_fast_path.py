@@ -0,0 +1,40 @@
+from unittest import mock
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from utilities import driver_factory
+from utilities.fast_path import FastPathError, _from_remote_value
+from utilities.ui_utilities.base_page import BasePage
+
+LOCATOR = (By.ID, "loader")
+
+
+def test_remote_values_convert_to_python():
+    remote = {"type": "object", "value": [
+        ["status", {"type": "string", "value": "ok"}],
+        ["value", {"type": "array", "value": [{"type": "number", "value": 16}, {"type": "null"},
+                                              {"type": "boolean", "value": True}]}],
+        [{"type": "number", "value": 1}, {"type": "map", "value": [["text", {"type": "undefined"}]]}],
+    ]}
+    assert _from_remote_value(remote) == {"status": "ok", "value": [16, None, True], 1: {"text": None}}
+
+
+@pytest.mark.parametrize("spent, fallback_timeout", [(4.0, 6.0), (12.0, 0.0)])
+def test_failed_fast_path_leaves_only_the_rest_of_the_timeout(spent, fallback_timeout):
+    now = [100.0]
+    fast_path = mock.Mock()
+
+    def wait_and_read(*args):
+        now[0] += spent
+        raise FastPathError("Execution context was destroyed")
+
+    fast_path.wait_and_read.side_effect = wait_and_read
+    driver = mock.Mock()
+    page = BasePage(driver)
+    page._wait_engine = mock.Mock()
+    with mock.patch.dict(driver_factory._fast_paths, {driver: fast_path}), \
+            mock.patch("time.monotonic", lambda: now[0]):
+        page.is_not_displayed(LOCATOR, timeout=10)
+    fast_path.wait_and_read.assert_called_once_with("invisible", LOCATOR, 10, None, None)
+    page._wait_engine.until.assert_called_once_with("invisible", LOCATOR, timeout=fallback_timeout, poll=None)
@@ -0,0 +1,44 @@
+from selenium.webdriver.common.by import By
+
+from utilities.locator_preflight import AMBIGUOUS, INVALID, NO_SNAPSHOT, OK, declared_locators, validate
+from utilities.ui_utilities.base_page import BasePage
+
+
+class CartPage(BasePage):
+    __title = (By.XPATH, "//span[text()='Оформлення замовлення']")
+    __option = (By.XPATH, '//li[text()="Відділення №180"]')
+    __selection = (By.CSS_SELECTOR, "span.select2-selection")
+    __second_selection = (By.XPATH, "(//span[@class='select2-selection']) [2]")
+    __comment = (By.ID, "order_note")
+    __broken = (By.XPATH, "//span[")
+    not_a_locator = ("title", "value")
+
+
+class EmptyPage(BasePage):
+    __title = (By.ID, "title")
+
+
+def _write_snapshot(path, name, body):
+    path.mkdir(parents=True, exist_ok=True)
+    path.joinpath(f"{name}.html").write_text(f"<html><body>{body}</body></html>", encoding="utf-8")
+
+
+def test_declared_locators_are_demangled():
+    names = [name for name, _ in declared_locators(CartPage)]
+    assert names == ["__title", "__option", "__selection", "__second_selection", "__comment", "__broken"]
+
+
+def test_locators_are_checked_against_all_snapshots_of_their_page(tmp_path):
+    _write_snapshot(tmp_path.joinpath("CartPage"), "checkout",
+                    "<span>Оформлення замовлення</span><span class='select2-selection'></span>"
+                    "<span class='select2-selection'></span><textarea id='order_note'></textarea>")
+    _write_snapshot(tmp_path.joinpath("CartPage"), "office-dropdown", "<ul><li>Відділення №181</li></ul>")
+
+    reports = {(report.page, report.name): report for report in validate([CartPage, EmptyPage], tmp_path)}
+    assert reports[("CartPage", "__title")].status == OK
+    assert reports[("CartPage", "__option")].matches == {"checkout": 0, "office-dropdown": 0}
+    assert reports[("CartPage", "__selection")].status == AMBIGUOUS
+    assert reports[("CartPage", "__second_selection")].status == OK
+    assert reports[("CartPage", "__comment")].status == OK
+    assert reports[("CartPage", "__broken")].status == INVALID
+    assert reports[("EmptyPage", "__title")].status == NO_SNAPSHOT
@@ -0,0 +1,85 @@
+import json
+from unittest import mock
+
+from utilities.auto_step.auto_step import autostep
+from utilities.network_capture import BETWEEN_STEPS, NetworkCapture
+
+
+def _log_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def _request(request_id, url, timestamp):
+    return _log_entry("Network.requestWillBeSent", requestId=request_id, timestamp=timestamp, type="XHR",
+                      request={"url": url, "method": "GET"})
+
+
+@autostep
+class _Page:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def set_town(self):
+        self._driver.logs.extend([
+            _request("1", "https://example.com/novaposhta/city?q=Київ", 10.0),
+            _log_entry("Network.responseReceived", requestId="1", response={"status": 200}),
+            _request("2", "https://example.com/minicart/reload", 10.1),
+            _log_entry("Network.loadingFinished", requestId="2", timestamp=10.2, encodedDataLength=512),
+            _log_entry("Network.loadingFinished", requestId="1", timestamp=10.9, encodedDataLength=2048),
+        ])
+        return self
+
+    def search_warehouses(self):
+        self._driver.logs.append(_request("3", "https://example.com/novaposhta/warehouses", 11.0))
+        return self
+
+
+class _Driver:
+    def __init__(self):
+        self.logs = [_request("old", "https://example.com/before-capture", 1.0)]
+
+    def get_log(self, kind):
+        logs, self.logs = self.logs, []
+        return logs
+
+
+def test_requests_are_tied_to_the_running_step(tmp_path):
+    driver = _Driver()
+    log_path = tmp_path.joinpath("network.jsonl")
+    capture = NetworkCapture(driver, log_path=log_path, test_name="test_checkout").start()
+    driver.logs.append(_request("0", "https://example.com/", 9.0))
+    with mock.patch("allure.attach") as attach:
+        _Page(driver).set_town()
+    capture.stop()
+
+    text = attach.call_args.args[0]
+    assert attach.call_args.kwargs["name"] == "network: _Page.set_town"
+    assert "_Page.set_town: 2 requests" in text
+    assert text.split("slowest 2:")[1].strip().startswith("900ms  GET https://example.com/novaposhta/city")
+
+    records = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    # The request that never finished is only logged when the capture stops.
+    assert [(record["step"], record["duration_ms"]) for record in records] == [
+        ("_Page.set_town", 900.0), ("_Page.set_town", 100.0), (BETWEEN_STEPS, None)]
+    assert {record["test"] for record in records} == {"test_checkout"}
+
+
+def test_request_outlasting_its_step_is_logged_once_finished(tmp_path):
+    driver = _Driver()
+    log_path = tmp_path.joinpath("network.jsonl")
+    capture = NetworkCapture(driver, log_path=log_path, test_name="test_checkout").start()
+    page = _Page(driver)
+    with mock.patch("allure.attach") as attach:
+        page.search_warehouses().set_town()
+        driver.logs.append(_log_entry("Network.loadingFinished", requestId="3", timestamp=14.5))
+        capture.stop()
+
+    assert "pending" in attach.call_args_list[0].args[0]
+    late = attach.call_args_list[-1]
+    assert late.kwargs["name"] == "network: requests outlasting their step"
+    assert "3500ms" in late.args[0]
+    assert "_Page.search_warehouses  GET https://example.com/novaposhta/warehouses" in late.args[0]
+    records = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert ("https://example.com/novaposhta/warehouses", 3500.0) in [
+        (record["url"], record["duration_ms"]) for record in records]
+    assert all(record["duration_ms"] is not None for record in records if record["step"] != BETWEEN_STEPS)
@@ -0,0 +1,92 @@
+from contextlib import nullcontext
+from unittest import mock
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from utilities.auto_step.auto_step import autostep
+from utilities.results_store import ResultsRecorder, ResultsStore, main
+from utilities.ui_utilities.base_page import BasePage
+
+
+@autostep
+class _CartPage(BasePage):
+    __buy_button = (By.ID, "product-addtocart-button")
+
+    def click_buy_product(self):
+        self._driver.execute("clickElement", {})
+        self.click(self.__buy_button)
+        return self
+
+    def open_checkout(self, fail=False):
+        self.click_buy_product()
+        if fail:
+            raise AssertionError("minicart did not open")
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    recorder = ResultsRecorder(ResultsStore(tmp_path / "results.sqlite"), label="chrome").start()
+    yield recorder
+    recorder.stop()
+    recorder.store.close()
+
+
+def _page(recorder):
+    driver = mock.Mock()
+    recorder.watch(driver)
+    page = _CartPage(driver)
+    page._wait_engine = mock.Mock()
+    return page
+
+
+def test_steps_include_their_sub_steps_and_commands(recorder):
+    page = _page(recorder)
+    recorder.start_test("test_product_cart.py::test_checkout")
+    page.open_checkout()
+    recorder.finish_test("passed", 3.0)
+
+    steps = recorder.store._connection.execute(
+        "SELECT step, depth, outcome, commands, retries FROM steps ORDER BY depth DESC").fetchall()
+    assert steps == [("_CartPage.click", 2, "passed", 0, 0), ("_CartPage.click_buy_product", 1, "passed", 1, 0),
+                     ("_CartPage.open_checkout", 0, "passed", 1, 0)]
+    parent = recorder.store.slowest_steps(runs=1, depth=0)
+    assert [(name, calls, commands) for name, calls, _, _, _, commands in parent] == [
+        ("_CartPage.open_checkout", 1, 1.0)]
+
+
+def test_flakiness_per_step_and_per_test(recorder):
+    page = _page(recorder)
+    for outcome in ("failed", "passed"):
+        recorder.start_test("test_product_cart.py::test_checkout")
+        with pytest.raises(AssertionError) if outcome == "failed" else nullcontext():
+            page.open_checkout(fail=outcome == "failed")
+        recorder.finish_test(outcome, 1.0)
+
+    assert recorder.store.step_flakiness(runs=1) == [("_CartPage.open_checkout", 2, 1, 0.5, 1)]
+    assert recorder.store.test_flakiness(runs=1) == [("test_product_cart.py::test_checkout", 1, 1, 0, 1.0)]
+    [(retries,)] = recorder.store._connection.execute("SELECT MAX(retries) FROM tests")
+    assert retries == 1
+
+
+def test_query_cli(recorder, capsys):
+    page = _page(recorder)
+    for _ in range(5):
+        recorder.start_test("test_product_cart.py::test_checkout")
+        page.click_buy_product()
+        recorder.finish_test("passed", 1.0)
+
+    assert main(["--path", str(recorder.store.path), "distribution", "_CartPage.click_buy_product"]) == 0
+    assert "_CartPage.click_buy_product: 5 passed calls, p50" in capsys.readouterr().out
+    assert main(["--path", str(recorder.store.path), "runs"]) == 0
+    assert "chrome" in capsys.readouterr().out
+
+
+def test_tests_without_a_driver_are_not_recorded(recorder, request):
+    # Only 'create_driver_for_page' requests the session recorder and starts tests, so the unit suite never
+    # reaches the real store.
+    assert "results_recorder" not in request.fixturenames
+    _page(recorder).open_checkout()
+    recorder.finish_test("passed", 1.0)
+    assert recorder.store._connection.execute("SELECT COUNT(*) FROM tests").fetchone() == (0,)
+    assert recorder.store._connection.execute("SELECT COUNT(*) FROM steps").fetchone() == (0,)
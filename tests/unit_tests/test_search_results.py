@@ -0,0 +1,70 @@
+from unittest import mock
+
+import pytest
+
+from page_objects.main_page_pack.main_page import MainPage
+from page_objects.main_page_pack.search_results import SearchResults
+from utilities.ui_utilities.wait_budget import wait_budget
+
+
+def _item(product_id, name, price=10.0, in_stock=True):
+    return {"product_id": product_id, "name": name, "url": f"https://example.com/{product_id}.html",
+            "price": price, "in_stock": in_stock}
+
+
+@pytest.fixture
+def pages():
+    return {
+        "page-2": ([_item("3", "Шуруп A2 4x16"), _item("4", "Шуруп A4 4x20", in_stock=False)], "page-3"),
+        "page-3": ([_item("5", "Гвинт M6", price=2.5)], None),
+    }
+
+
+def _results(pages, loaded):
+    def load_page(url):
+        loaded.append(url)
+        return pages[url]
+
+    return SearchResults([_item("1", "Комплект гвинтів Aquant"), _item("2", "Шуруп A2 4x12")], "page-2",
+                         load_page)
+
+
+def test_lookup_on_first_page_loads_nothing(pages):
+    loaded = []
+    results = _results(pages, loaded)
+    assert results.by_id(2).name == "Шуруп A2 4x12"
+    assert results.by_name("  комплект гвинтів AQUANT ").product_id == "1"
+    assert loaded == []
+
+
+def test_lookup_loads_pages_until_found(pages):
+    loaded = []
+    results = _results(pages, loaded)
+    assert results.by_id("4").in_stock is False
+    assert loaded == ["page-2"]
+    assert results.find(lambda result: result.price < 5).name == "Гвинт M6"
+    assert loaded == ["page-2", "page-3"]
+    assert results.next_url is None
+
+
+def test_missing_result_raises_after_last_page(pages):
+    loaded = []
+    results = _results(pages, loaded)
+    with pytest.raises(LookupError):
+        results.by_id("404")
+    assert [result.product_id for result in results] == ["1", "2", "3", "4", "5"]
+
+
+def test_results_wait_for_a_new_document_within_the_wait_budget():
+    driver = mock.Mock()
+    driver.execute_script.return_value = {"items": [_item("1", "Шуруп A2 4x12")], "next_url": None}
+    page = MainPage(driver)
+    page._wait_engine = mock.MagicMock()
+    with wait_budget(20):
+        results = page.search("шуруп").get_search_results()
+    assert "data-before-search" in driver.execute_script.call_args_list[0].args[0]
+    condition, (by, listing) = page._wait_engine.until.call_args_list[-1].args
+    assert condition == "present"
+    assert page._wait_engine.until.call_args_list[-1].kwargs["timeout"] == pytest.approx(20, abs=1)
+    assert listing.count("/html[not(@data-before-search)]") == 2
+    assert results.by_id("1").name == "Шуруп A2 4x12"
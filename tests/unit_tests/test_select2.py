@@ -0,0 +1,68 @@
+from unittest import mock
+
+import pytest
+from selenium.common import JavascriptException, NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from page_objects.checkout_page_pack.checkout_page import CheckoutPage
+from utilities.ui_utilities import select2
+from utilities.ui_utilities.select2 import Select2
+
+LOCATOR = (By.ID, "town-select")
+
+
+def _driver(*results):
+    driver = mock.Mock()
+    driver.execute_async_script.side_effect = list(results)
+    return driver
+
+
+def _scripts(driver):
+    return [call.args[0] for call in driver.execute_async_script.call_args_list]
+
+
+@pytest.fixture(autouse=True)
+def present_elements():
+    with mock.patch.object(Select2, "get_present_element", return_value="select-element"):
+        yield
+
+
+@pytest.mark.parametrize("result, error, message", [
+    ({"status": "timeout"}, TimeoutException, "did not respond within 30 seconds"),
+    ({"status": "error", "message": "jQuery is not defined"}, JavascriptException, "jQuery is not defined"),
+    ({"status": "missing", "available": ["Київ", "Київська обл."]}, NoSuchElementException, "available: \\['Київ'"),
+])
+def test_script_status_becomes_an_exception(result, error, message):
+    with pytest.raises(error, match=message):
+        Select2(_driver(result), LOCATOR).choose("Львів")
+
+
+def test_select_by_text_opens_searches_and_chooses():
+    driver = _driver(*[{"status": "ok"}] * 3)
+    assert Select2(driver, LOCATOR).select_by_text("Київ", exact=True)
+    assert _scripts(driver) == [select2._OPEN_SCRIPT, select2._SEARCH_SCRIPT, select2._CHOOSE_SCRIPT]
+    assert driver.execute_async_script.call_args_list[2].args[1:] == ("select-element", "Київ", True, 30000)
+
+
+def test_checkout_town_in_widget_mode():
+    driver = _driver(*[{"status": "ok"}] * 3)
+    with mock.patch.object(Select2, "fast_mode", False):
+        CheckoutPage(driver).set_town("Київ ").select_town_option()
+    assert _scripts(driver) == [select2._OPEN_SCRIPT, select2._SEARCH_SCRIPT, select2._CHOOSE_SCRIPT]
+    assert driver.execute_async_script.call_args_list[1].args[1:] == ("select-element", "Київ ", 30000)
+    assert driver.execute_async_script.call_args_list[2].args[1:] == ("select-element", "Київ", True, 30000)
+
+
+def test_checkout_town_in_fast_mode():
+    driver = _driver({"status": "ok"})
+    with mock.patch.object(Select2, "fast_mode", True):
+        page = CheckoutPage(driver).set_town("Київ ")
+        driver.execute_async_script.assert_not_called()
+        page.select_town_option()
+    assert _scripts(driver) == [select2._FAST_SELECT_SCRIPT]
+    assert driver.execute_async_script.call_args.args[1:] == ("select-element", "Київ", True, None, 30000)
+
+
+def test_town_option_needs_a_town():
+    with pytest.raises(ValueError, match="set_town"):
+        CheckoutPage(_driver()).select_town_option()
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+from selenium.common import TimeoutException
+from selenium.webdriver.common.by import By
+
+from utilities.ui_utilities.base_page import BasePage
+from utilities.ui_utilities.wait_budget import WaitBudget, WaitBudgetExceeded, wait_budget
+
+
+class _SlowEngine:
+    """Wait engine stub that times out after the given timeout without sleeping."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.timeouts = []
+
+    def until(self, condition, locator, timeout=None, poll=None):
+        self.timeouts.append(timeout)
+        self.clock.advance(timeout)
+        raise TimeoutException()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake_clock = _Clock()
+    with mock.patch("time.monotonic", fake_clock):
+        yield fake_clock
+
+
+def test_timeout_is_capped_by_remaining_budget(clock):
+    budget = WaitBudget(30)
+    assert budget.timeout_for(60) == 30
+    clock.advance(25)
+    assert budget.timeout_for(60) == pytest.approx(5)
+    assert budget.timeout_for(2) == 2
+
+
+def test_budget_clock_starts_with_first_wait(clock):
+    budget = WaitBudget(10)
+    clock.advance(100)
+    assert budget.remaining() == 10
+    assert budget.timeout_for(60) == 10
+
+
+def test_exhausted_budget_raises_with_breakdown(clock):
+    budget = WaitBudget(10)
+    budget.timeout_for(60)
+    budget.record("CheckoutPage ('xpath', '//li')", "clickable", 10, "timeout")
+    clock.advance(10)
+    with pytest.raises(WaitBudgetExceeded, match=r"CheckoutPage \('xpath', '//li'\)"):
+        budget.timeout_for(60, "next wait")
+
+
+def test_negative_check_does_not_swallow_budget_exhaustion(clock):
+    page = BasePage(mock.Mock())
+    page._wait_engine = _SlowEngine(clock)
+    with wait_budget(15) as budget:
+        assert page.is_not_displayed((By.ID, "loader")) is False
+        with pytest.raises(WaitBudgetExceeded, match="spent waiting 15.00s in 2 waits"):
+            page.is_not_displayed((By.ID, "loader"))
+    assert page._wait_engine.timeouts == [10, 5]
+    assert [record[3] for record in budget.records] == ["timeout", "timeout"]
+
+
+def test_snapshot_check_does_not_wait():
+    driver = mock.Mock()
+    driver.find_elements.return_value = []
+    page = BasePage(driver)
+    page._wait_engine = mock.Mock()
+    assert page.is_not_displayed((By.ID, "loader"), snapshot=True) is True
+    page._wait_engine.until.assert_not_called()
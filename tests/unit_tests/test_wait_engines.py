@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pytest
+from selenium.common import JavascriptException, TimeoutException
+
+from utilities.ui_utilities.wait_engines import ObserverWait, run_async_script
+
+LOCATOR = ("id", "loader")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake_clock = _Clock()
+    with mock.patch("time.monotonic", fake_clock):
+        yield fake_clock
+
+
+def test_script_timeout_is_only_raised_when_too_small():
+    driver = mock.Mock()
+    driver.execute_async_script.return_value = {"status": "ok", "value": True}
+    run_async_script(driver, 30, "select2")
+    ObserverWait(driver, 60).until("invisible", ("id", "loader"))
+    run_async_script(driver, 30, "select2")
+    ObserverWait(driver, 25).until("invisible", ("id", "loader"))
+    ObserverWait(driver, 60).until("invisible", ("id", "loader"))
+    assert driver.set_script_timeout.call_args_list == [mock.call(35), mock.call(65)]
+    assert driver.execute_async_script.call_count == 5
+
+
+@pytest.mark.parametrize("result, outcome", [
+    ({"status": "ok", "value": ["element"]}, ["element"]),
+    ({"status": "timeout"}, pytest.raises(TimeoutException, match="was not present within 2 seconds")),
+    ({"status": "error", "message": "SyntaxError: bad xpath"}, pytest.raises(JavascriptException, match="bad xpath")),
+])
+def test_script_status_is_mapped(result, outcome):
+    driver = mock.Mock()
+    driver.execute_async_script.return_value = result
+    if isinstance(outcome, list):
+        assert ObserverWait(driver, 2).until("present", LOCATOR) == outcome
+        return
+    with outcome:
+        ObserverWait(driver, 2).until("present", LOCATOR)
+
+
+def test_script_errors_are_retried_with_backoff_until_the_deadline(clock):
+    driver = mock.Mock()
+    driver.execute_async_script.side_effect = JavascriptException("document unloaded")
+    with mock.patch("time.sleep", side_effect=clock.advance) as sleep, \
+            pytest.raises(TimeoutException, match="not visible within 2 seconds"):
+        ObserverWait(driver, 2).until("visible", LOCATOR)
+    assert [call.args[0] for call in sleep.call_args_list] == pytest.approx([0.1, 0.2, 0.4, 0.8, 0.5])
+    assert driver.execute_async_script.call_count == 6
+
+
+def test_navigation_error_then_success():
+    driver = mock.Mock()
+    driver.execute_async_script.side_effect = [JavascriptException("document unloaded"),
+                                               {"status": "ok", "value": True}]
+    with mock.patch("time.sleep"):
+        assert ObserverWait(driver, 2).until("invisible", LOCATOR) is True
+    assert driver.execute_async_script.call_count == 2
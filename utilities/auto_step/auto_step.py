@@ -1,7 +1,12 @@
+import functools
 import inspect
+import time
 
 import allure
 
+_step_listeners = []
+_step_stack = []
+
 
 def autostep(cls):
     """
@@ -15,9 +20,74 @@ def autostep(cls):
 
                 Note:
                 - Methods whose names start with an underscore (_) are not wrapped in Allure steps.
+                - Step listeners (see 'add_step_listener') are notified inside the Allure step, so anything
+                  they attach to the report lands in that step.
 
                 """
     for name, method in inspect.getmembers(cls, inspect.isfunction):
         if not name.startswith('_'):
-            setattr(cls, name, allure.step(method))
+            setattr(cls, name, allure.step(_notified(method)))
     return cls
+
+
+def add_step_listener(listener):
+    """
+    Registers an object notified about every autostep step.
+
+    Parameters:
+    - listener: An object with 'step_started(name, depth)' and 'step_finished(name, depth, duration, error)'
+      methods. 'depth' is 0 for steps called directly from the test, 1 for steps they call, and so on.
+    """
+    _step_listeners.append(listener)
+
+
+def remove_step_listener(listener):
+    """
+    Unregisters a listener added with 'add_step_listener'.
+
+    Parameters:
+    - listener: The listener to remove.
+    """
+    if listener in _step_listeners:
+        _step_listeners.remove(listener)
+
+
+def current_step():
+    """
+    Returns:
+    - str or None: The name ('Class.method') of the innermost running step, if any.
+    """
+    return _step_stack[-1] if _step_stack else None
+
+
+def _notified(method):
+    """
+    Wraps a method so that step listeners are notified when it starts and finishes.
+
+    Parameters:
+    - method: The function to wrap.
+
+    Returns:
+    - The wrapping function.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        name = f"{type(self).__name__}.{method.__name__}"
+        depth = len(_step_stack)
+        _step_stack.append(name)
+        for listener in list(_step_listeners):
+            listener.step_started(name, depth)
+        started = time.monotonic()
+        error = None
+        try:
+            return method(self, *args, **kwargs)
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            _step_stack.pop()
+            for listener in list(_step_listeners):
+                listener.step_finished(name, depth, time.monotonic() - started, error)
+
+    return wrapper
+
@@ -0,0 +1,252 @@
+import json
+import time
+from pathlib import Path
+from urllib.parse import urldefrag, urlsplit
+
+from selenium.common import TimeoutException, WebDriverException
+
+_project_path = Path(__file__).resolve().parent.parent
+_checkpoints_path = _project_path.joinpath("checkpoints")
+
+_READ_STORAGE_SCRIPT = r"""
+function dump(storage) {
+    var items = {};
+    for (var index = 0; index < storage.length; index++) {
+        var key = storage.key(index);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_WRITE_STORAGE_SCRIPT = r"""
+function load(storage, items) {
+    storage.clear();
+    Object.keys(items).forEach(function (key) { storage.setItem(key, items[key]); });
+}
+load(window.localStorage, arguments[0]);
+load(window.sessionStorage, arguments[1]);
+"""
+
+
+class CheckpointError(Exception):
+    """
+    Raised when a checkpoint cannot be restored: it has expired, the site redirected away from it or it fails
+    its validity check.
+    The caller is expected to replay the steps the checkpoint stands for instead.
+    """
+
+
+class Checkpoint:
+    """
+    Saved browser state: cookies, localStorage and sessionStorage of the current origin, and the current URL.
+
+    Attributes:
+    - name: The checkpoint name.
+    - url: The URL the browser was on.
+    - cookies: The cookies as returned by WebDriver 'get_cookies'.
+    - local_storage: localStorage items of the URL's origin.
+    - session_storage: sessionStorage items of the URL's origin.
+    - created_at: Creation time (epoch seconds).
+    - expires_at: Time after which the checkpoint is not restored any more (epoch seconds).
+    """
+
+    def __init__(self, name, url, cookies, local_storage, session_storage, created_at, expires_at):
+        self.name = name
+        self.url = url
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    @property
+    def origin(self):
+        """
+        Returns:
+        - str: The scheme and host of the checkpoint URL.
+        """
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def is_expired(self, now=None):
+        """
+        Returns:
+        - bool: True once the checkpoint's time to live is over.
+        """
+        return (time.time() if now is None else now) >= self.expires_at
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def save_checkpoint(driver, name, ttl):
+    """
+    Captures the browser state of the current tab.
+
+    Parameters:
+    - driver: The WebDriver instance.
+    - name: The checkpoint name.
+    - ttl: Seconds the checkpoint may be restored for (e.g. shorter than the server-side cart lifetime).
+
+    Returns:
+    - Checkpoint: The captured state.
+    """
+    storage = driver.execute_script(_READ_STORAGE_SCRIPT)
+    now = time.time()
+    return Checkpoint(name, driver.current_url, driver.get_cookies(), storage["local"], storage["session"],
+                      now, now + ttl)
+
+
+def restore_checkpoint(driver, checkpoint, validate=None):
+    """
+    Loads a checkpoint into a driver and opens its URL.
+
+    Cookies and storage can only be written for the origin the browser is on, so the origin is opened first
+    (on its lightweight '/robots.txt'), the state written, and then the checkpoint URL loaded with it.
+
+    Parameters:
+    - driver: A WebDriver instance, preferably fresh.
+    - checkpoint: The Checkpoint to restore.
+    - validate: Optional callable receiving the driver once the URL is loaded, returning whether the restored
+      state is usable (e.g. the cart still holds the product). A TimeoutException it raises counts as False.
+
+    Raises:
+    - CheckpointError: If the checkpoint has expired, the site redirected away from the checkpoint URL
+      (e.g. an expired server-side cart) or 'validate' returned False.
+    """
+    if checkpoint.is_expired():
+        raise CheckpointError(f"Checkpoint '{checkpoint.name}' expired")
+    driver.get(f"{checkpoint.origin}/robots.txt")
+    driver.delete_all_cookies()
+    now = time.time()
+    for cookie in checkpoint.cookies:
+        if cookie.get("expiry") is not None and cookie["expiry"] <= now:
+            continue
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException:
+            # Cookies of a parent or sibling domain the origin may not set; the session cookies are host ones.
+            pass
+    driver.execute_script(_WRITE_STORAGE_SCRIPT, checkpoint.local_storage, checkpoint.session_storage)
+    driver.get(checkpoint.url)
+    if urldefrag(driver.current_url)[0] != urldefrag(checkpoint.url)[0]:
+        raise CheckpointError(f"Checkpoint '{checkpoint.name}' redirected to {driver.current_url}")
+    if validate is None:
+        return
+    try:
+        valid = validate(driver)
+    except TimeoutException:
+        valid = False
+    if not valid:
+        raise CheckpointError(f"Checkpoint '{checkpoint.name}' failed its validity check")
+
+
+class CheckpointStore:
+    """
+    Named checkpoints kept in memory and in 'checkpoints/<name>.json', so that later tests, later
+    parametrizations of a test and later runs can start from a state instead of replaying the steps leading
+    to it.
+
+    Attributes:
+    - path: The checkpoint directory.
+    - ttl: Default time to live of new checkpoints in seconds.
+
+    Example:
+    store = CheckpointStore(ttl=900)
+    store.fork(driver, "checkout-with-product", build=open_checkout,
+               validate=lambda driver: CheckoutPage(driver).is_checkout_page_opened())
+    checkout_page = CheckoutPage(driver)
+    """
+
+    def __init__(self, path=_checkpoints_path, ttl=900):
+        """
+        Initializes the CheckpointStore instance.
+
+        Parameters:
+        - path: The checkpoint directory.
+        - ttl: Default time to live of new checkpoints in seconds.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.__checkpoints = {}
+
+    def __file(self, name):
+        return self.path.joinpath(f"{name}.json")
+
+    def get(self, name):
+        """
+        Parameters:
+        - name: The checkpoint name.
+
+        Returns:
+        - Checkpoint or None: The unexpired checkpoint, if any.
+        """
+        checkpoint = self.__checkpoints.get(name)
+        if checkpoint is None and self.__file(name).exists():
+            checkpoint = Checkpoint.from_dict(json.loads(self.__file(name).read_text(encoding="utf-8")))
+        if checkpoint is None or checkpoint.is_expired():
+            self.discard(name)
+            return None
+        self.__checkpoints[name] = checkpoint
+        return checkpoint
+
+    def save(self, driver, name, ttl=None):
+        """
+        Captures the current browser state under a name, replacing any previous checkpoint of that name.
+
+        Parameters:
+        - driver: The WebDriver instance.
+        - name: The checkpoint name.
+        - ttl: Time to live in seconds (default: the store's).
+
+        Returns:
+        - Checkpoint: The saved checkpoint.
+        """
+        checkpoint = save_checkpoint(driver, name, self.ttl if ttl is None else ttl)
+        self.__checkpoints[name] = checkpoint
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.__file(name).write_text(json.dumps(checkpoint.to_dict(), ensure_ascii=False), encoding="utf-8")
+        return checkpoint
+
+    def discard(self, name):
+        """
+        Forgets a checkpoint.
+
+        Parameters:
+        - name: The checkpoint name.
+        """
+        self.__checkpoints.pop(name, None)
+        self.__file(name).unlink(missing_ok=True)
+
+    def fork(self, driver, name, build, validate=None):
+        """
+        Brings a driver to a named checkpoint: restores it if a valid one exists, otherwise runs the steps
+        leading to it and saves the result.
+
+        Parameters:
+        - driver: A WebDriver instance, preferably fresh.
+        - name: The checkpoint name.
+        - build: Callable receiving the driver and performing the steps the checkpoint stands for.
+        - validate: Optional validity check, see 'restore_checkpoint'.
+
+        Returns:
+        - bool: True if the checkpoint was restored, False if it was (re)built.
+        """
+        checkpoint = self.get(name)
+        if checkpoint is not None:
+            try:
+                restore_checkpoint(driver, checkpoint, validate)
+                return True
+            except CheckpointError:
+                self.discard(name)
+                driver.delete_all_cookies()
+                driver.execute_script(_WRITE_STORAGE_SCRIPT, {}, {})
+        build(driver)
+        self.save(driver, name)
+        return False
@@ -1,25 +1,105 @@
-from selenium import webdriver
+import logging
+import weakref
 
 CHROME = 1
 FIREFOX = 2
 
+_logger = logging.getLogger(__name__)
+_fast_paths = weakref.WeakKeyDictionary()
 
-def create_driver_factory(driver_id, options=None):
+
+def create_driver_options(driver_id, headless=False, network_capture=False):
+    """
+    Create a browser options object matching the specified browser.
+
+    Args:
+        driver_id (int): An identifier for the desired browser (e.g., CHROME or FIREFOX).
+        headless (bool): Whether the browser should be started in headless mode.
+        network_capture (bool): Whether Chrome should record network events in its performance log
+            (read by 'utilities.network_capture.NetworkCapture').
+
+    Returns:
+        ArgOptions: Chrome or Firefox options for the specified browser.
+
+    """
+    from selenium import webdriver
+
+    options_mapping = {
+        CHROME: webdriver.ChromeOptions,
+        FIREFOX: webdriver.FirefoxOptions
+    }
+    options = options_mapping.get(int(driver_id), webdriver.ChromeOptions)()
+    if headless:
+        options.add_argument("--headless")
+    if network_capture and isinstance(options, webdriver.ChromeOptions):
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return options
+
+
+def create_driver_factory(driver_id, options=None, fast_path=False, disable_animations=False):
     """
      Create a WebDriver instance for the specified browser.
 
      Args:
          driver_id (int): An identifier for the desired browser (e.g., CHROME or FIREFOX).
          options (dict): Optional browser configuration options.
+         fast_path (bool): Whether to open a CDP/BiDi websocket next to the session for hot read and wait
+             commands (see 'get_fast_path'). If it cannot be opened, every command keeps using HTTP.
+         disable_animations (bool): Whether to disable CSS transitions, animations, smooth scrolling and jQuery
+             animations in every page the browser loads (see 'utilities.ui_utilities.animations').
 
     Returns:
         WebDriver: An instance of the Selenium WebDriver for the specified browser.
 
     """
+    from selenium import webdriver
+
     driver_mapping = {
         CHROME: webdriver.Chrome,
         FIREFOX: webdriver.Firefox
     }
+    if fast_path and int(driver_id) == FIREFOX:
+        options = options or create_driver_options(driver_id)
+        options.set_capability("webSocketUrl", True)
     driver_class = driver_mapping.get(int(driver_id), webdriver.Chrome)
     driver = driver_class(options=options)
+    if fast_path:
+        from utilities.fast_path import FastPathError, open_fast_path
+
+        try:
+            _fast_paths[driver] = open_fast_path(driver)
+        except FastPathError as error:
+            _logger.warning("Fast path disabled, falling back to WebDriver HTTP: %s", error)
+    if disable_animations:
+        from utilities.ui_utilities import animations
+
+        animations.disable_animations(driver)
     return driver
+
+
+def get_fast_path(driver):
+    """
+    Get the fast-path channel opened for a driver by 'create_driver_factory'.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        FastPath: The open channel, or None if the driver has none.
+
+    """
+    return _fast_paths.get(driver)
+
+
+def close_fast_path(driver):
+    """
+    Close the fast-path channel of a driver, if any. Call it before quitting the driver.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    """
+    channel = _fast_paths.pop(driver, None)
+    if channel is not None:
+        channel.close()
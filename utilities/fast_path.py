@@ -0,0 +1,336 @@
+import itertools
+import json
+import threading
+from urllib.parse import urlsplit
+
+import trio
+from selenium.common import TimeoutException
+from trio_websocket import ConnectionClosed, open_websocket_url
+
+from utilities.ui_utilities.wait_engines import OBSERVER_WAIT_SCRIPT, ObserverWait
+
+CDP = "cdp"
+BIDI = "bidi"
+
+# Runs the in-browser wait script as a promise and optionally reads a property of the found element,
+# so a wait and the read that follows it cost a single websocket message.
+_WAIT_AND_READ_EXPRESSION = r"""
+new Promise(function (resolve) {
+    (function () { %(script)s }).apply(null, %(args)s.concat([resolve]));
+}).then(function (result) {
+    var read = %(read)s;
+    if (result.status !== "ok") { return {status: result.status, message: result.message}; }
+    if (read === null || result.value === true) { return {status: "ok", value: true}; }
+    if (read === "text") {
+        return {status: "ok", value: result.value.innerText.replace(/\u00a0/g, " ").trim()};
+    }
+    return {status: "ok", value: result.value.getAttribute(read)};
+})
+"""
+
+
+class FastPathError(Exception):
+    """
+    Raised when a fast-path command fails; callers fall back to the classic WebDriver HTTP command.
+    """
+
+
+class FastPath:
+    """
+    Persistent CDP (Chrome) or WebDriver BiDi (Firefox) websocket opened next to a WebDriver session.
+
+    Commands are sent over the single websocket from a background trio thread, so several of them can be in
+    flight at once ('execute_many') and no HTTP request per command is needed. Only hot read and wait
+    operations are offered here; anything else keeps using the classic WebDriver commands.
+
+    Attributes:
+    - protocol: CDP or BIDI.
+    - context: BiDi browsing context the scripts are evaluated in (None for CDP, where the socket belongs to
+      the page target itself).
+    """
+
+    def __init__(self, url, protocol, context=None):
+        """
+        Opens the websocket and starts the background thread.
+
+        Parameters:
+        - url: The websocket URL.
+        - protocol: CDP or BIDI.
+        - context: BiDi browsing context id (the WebDriver window handle).
+
+        Raises:
+        - FastPathError: If the websocket cannot be opened.
+        """
+        self.protocol = protocol
+        self.context = context
+        self.__url = url
+        self.__ids = itertools.count(1)
+        self.__pending = {}
+        self.__event_listeners = []
+        self.__ready = threading.Event()
+        self.__error = None
+        self.__socket = None
+        self.__closed = None
+        self.__trio_token = None
+        self.__thread = threading.Thread(target=trio.run, args=(self.__serve,), daemon=True, name="fast-path")
+        self.__thread.start()
+        self.__ready.wait()
+        if self.__error is not None:
+            raise FastPathError(f"Could not open {protocol} websocket {url}: {self.__error!r}") from self.__error
+
+    async def __serve(self):
+        self.__trio_token = trio.lowlevel.current_trio_token()
+        self.__closed = trio.Event()
+        try:
+            async with open_websocket_url(self.__url, max_message_size=64 * 1024 * 1024,
+                                          connect_timeout=10) as socket:
+                self.__socket = socket
+                async with trio.open_nursery() as nursery:
+                    nursery.start_soon(self.__receive)
+                    self.__ready.set()
+                    await self.__closed.wait()
+                    nursery.cancel_scope.cancel()
+        except Exception as error:
+            self.__error = error
+        finally:
+            self.__closed.set()
+            for event, slot in self.__pending.values():
+                slot.setdefault("error", "websocket closed")
+                event.set()
+            self.__ready.set()
+
+    async def __receive(self):
+        while True:
+            try:
+                message = json.loads(await self.__socket.get_message())
+            except ConnectionClosed:
+                self.__closed.set()
+                return
+            if "id" not in message and "method" in message:
+                for listener in list(self.__event_listeners):
+                    listener(message["method"], message.get("params", {}))
+                continue
+            waiter = self.__pending.pop(message.get("id"), None)
+            if waiter is not None:
+                event, slot = waiter
+                slot["message"] = message
+                event.set()
+
+    async def __send(self, method, params):
+        command_id = next(self.__ids)
+        event, slot = trio.Event(), {}
+        self.__pending[command_id] = (event, slot)
+        await self.__socket.send_message(json.dumps({"id": command_id, "method": method, "params": params}))
+        await event.wait()
+        if "error" in slot:
+            raise FastPathError(slot["error"])
+        message = slot["message"]
+        if "error" in message:
+            raise FastPathError(f"{method}: {message['error']} {message.get('message', '')}".strip())
+        return message["result"]
+
+    async def __send_many(self, commands, timeout):
+        results = [None] * len(commands)
+        errors = []
+
+        async def send(index, method, params):
+            try:
+                results[index] = await self.__send(method, params)
+            except FastPathError as error:
+                errors.append(error)
+
+        with trio.fail_after(timeout):
+            async with trio.open_nursery() as nursery:
+                for index, (method, params) in enumerate(commands):
+                    nursery.start_soon(send, index, method, params)
+        if errors:
+            raise errors[0]
+        return results
+
+    def add_event_listener(self, listener):
+        """
+        Registers a callable receiving every protocol event sent over the websocket.
+
+        The listener is called from the background thread with the event method and params, so it must be
+        quick and thread-safe (e.g. append to a deque). Events still have to be enabled with the protocol's
+        own commands ('Network.enable' for CDP, 'session.subscribe' for BiDi).
+
+        Parameters:
+        - listener: Callable taking (method, params).
+        """
+        self.__event_listeners.append(listener)
+
+    def remove_event_listener(self, listener):
+        """
+        Unregisters a listener added with 'add_event_listener'.
+
+        Parameters:
+        - listener: The listener to remove.
+        """
+        if listener in self.__event_listeners:
+            self.__event_listeners.remove(listener)
+
+    def execute_many(self, commands, timeout=30):
+        """
+        Sends several commands at once without waiting for each response in turn (pipelining).
+
+        Parameters:
+        - commands: A list of (method, params) tuples.
+        - timeout: Maximum time to wait for all responses, in seconds.
+
+        Returns:
+        - list: The results in the order of the commands.
+
+        Raises:
+        - FastPathError: If the channel is closed or a command fails or times out.
+        """
+        if self.__closed is None or self.__closed.is_set():
+            raise FastPathError("The fast-path websocket is closed")
+        try:
+            return trio.from_thread.run(self.__send_many, commands, timeout, trio_token=self.__trio_token)
+        except trio.TooSlowError:
+            raise FastPathError(f"No response within {timeout} seconds") from None
+        except trio.RunFinishedError:
+            raise FastPathError("The fast-path websocket is closed") from None
+
+    def execute(self, method, params, timeout=30):
+        """
+        Sends one protocol command.
+
+        Parameters:
+        - method: The protocol method, e.g. 'Runtime.evaluate' or 'script.evaluate'.
+        - params: The command parameters.
+        - timeout: Maximum time to wait for the response, in seconds.
+
+        Returns:
+        - dict: The command result.
+        """
+        return self.execute_many([(method, params)], timeout)[0]
+
+    def __evaluate_command(self, expression):
+        if self.protocol == CDP:
+            return "Runtime.evaluate", {"expression": expression, "awaitPromise": True, "returnByValue": True}
+        return "script.evaluate", {"expression": expression, "target": {"context": self.context},
+                                   "awaitPromise": True, "resultOwnership": "none"}
+
+    def __evaluate_result(self, result):
+        if self.protocol == CDP:
+            if "exceptionDetails" in result:
+                raise FastPathError(result["exceptionDetails"].get("exception", {}).get("description")
+                                    or result["exceptionDetails"].get("text"))
+            return result["result"].get("value")
+        if result.get("type") == "exception":
+            raise FastPathError(result["exceptionDetails"].get("text"))
+        return _from_remote_value(result["result"])
+
+    def evaluate_many(self, expressions, timeout=30):
+        """
+        Evaluates several JavaScript expressions in the page in one pipelined batch.
+
+        Parameters:
+        - expressions: The expressions; promises are awaited.
+        - timeout: Maximum time to wait for all results, in seconds.
+
+        Returns:
+        - list: The JSON-serializable values of the expressions.
+        """
+        commands = [self.__evaluate_command(expression) for expression in expressions]
+        return [self.__evaluate_result(result) for result in self.execute_many(commands, timeout)]
+
+    def evaluate(self, expression, timeout=30):
+        """
+        Evaluates a JavaScript expression in the page.
+
+        Parameters:
+        - expression: The expression; a promise is awaited.
+        - timeout: Maximum time to wait for the result, in seconds.
+
+        Returns:
+        - The JSON-serializable value of the expression.
+        """
+        return self.evaluate_many([expression], timeout)[0]
+
+    def wait_and_read(self, condition, locator, timeout, read=None, fallback_interval=None):
+        """
+        Waits for an element condition inside the browser and reads the element in the same message.
+
+        Parameters:
+        - condition: One of the wait_engines conditions (VISIBLE, INVISIBLE, CLICKABLE, PRESENT).
+        - locator: A tuple representing the locator strategy and value.
+        - timeout: Maximum time to wait, in seconds.
+        - read: None to only wait, 'text' for the visible text or an attribute name.
+        - fallback_interval: In-browser re-check interval in seconds (default: ObserverWait.fallback_interval).
+
+        Returns:
+        - The text or attribute value, or True when nothing is read.
+
+        Raises:
+        - TimeoutException: If the condition does not hold within the timeout.
+        - FastPathError: If the command fails (e.g. the page navigated away mid-wait).
+        """
+        by, value = locator
+        if fallback_interval is None:
+            fallback_interval = ObserverWait.fallback_interval
+        expression = _WAIT_AND_READ_EXPRESSION % {
+            "script": OBSERVER_WAIT_SCRIPT,
+            "args": json.dumps([by, value, condition, int(timeout * 1000), int(fallback_interval * 1000)]),
+            "read": json.dumps(read),
+        }
+        result = self.evaluate(expression, timeout=timeout + 5)
+        if result["status"] == "timeout":
+            raise TimeoutException(f"Element located by {locator} was not {condition} within {timeout} seconds.")
+        if result["status"] != "ok":
+            raise FastPathError(result.get("message"))
+        return result["value"]
+
+    def close(self):
+        """
+        Closes the websocket and stops the background thread.
+        """
+        if self.__closed is not None and self.__trio_token is not None:
+            try:
+                trio.from_thread.run_sync(self.__closed.set, trio_token=self.__trio_token)
+            except trio.RunFinishedError:
+                pass
+        self.__thread.join(timeout=5)
+
+
+def _from_remote_value(remote):
+    """
+    Converts a BiDi RemoteValue into the matching Python value.
+    """
+    kind, value = remote.get("type"), remote.get("value")
+    if kind in ("undefined", "null"):
+        return None
+    if kind == "array":
+        return [_from_remote_value(item) for item in value]
+    if kind in ("object", "map"):
+        return {key if isinstance(key, str) else _from_remote_value(key): _from_remote_value(item)
+                for key, item in value}
+    return value
+
+
+def open_fast_path(driver):
+    """
+    Opens the fast-path websocket for a running WebDriver session.
+
+    Chrome is reached through the DevTools endpoint of its debugger address (CDP); Firefox through the
+    WebDriver BiDi 'webSocketUrl' of the session, which requires the 'webSocketUrl' capability.
+
+    Parameters:
+    - driver: The WebDriver instance.
+
+    Returns:
+    - FastPath: The open channel for the current window.
+
+    Raises:
+    - FastPathError: If the browser offers no usable websocket.
+    """
+    capabilities = driver.capabilities
+    debugger_address = capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if debugger_address:
+        return FastPath(f"ws://{debugger_address}/devtools/page/{driver.current_window_handle}", CDP)
+    web_socket_url = capabilities.get("webSocketUrl")
+    if isinstance(web_socket_url, str) and urlsplit(web_socket_url).scheme in ("ws", "wss"):
+        return FastPath(web_socket_url, BIDI, context=driver.current_window_handle)
+    raise FastPathError(f"{capabilities.get('browserName')} session exposes no CDP or BiDi websocket")
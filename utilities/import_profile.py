@@ -0,0 +1,133 @@
+"""
+Reports the import cost per module of the framework, using the interpreter's '-X importtime' output.
+
+Usage:
+    python -m utilities.import_profile
+    python -m utilities.import_profile page_objects.checkout_page_pack.checkout_page --top 15
+    python -m utilities.import_profile --collect
+    python -m utilities.import_profile --collect tests/ui_tests
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+_project_path = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = [
+    "conftest",
+    "page_objects.main_page_pack.main_page",
+    "page_objects.product_page_pack.product_page",
+    "page_objects.checkout_page_pack.checkout_page",
+]
+
+
+class ImportRecord:
+    """
+    Import time of a single module.
+
+    Attributes:
+    - name: The module name.
+    - self_us: Time spent in the module itself, in microseconds.
+    - cumulative_us: Time including the modules it imported, in microseconds.
+    - depth: Nesting level in the import tree (0 for top-level imports).
+    """
+
+    def __init__(self, name, self_us, cumulative_us, depth):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+
+def parse_importtime(output):
+    """
+    Parses the '-X importtime' report printed to stderr.
+
+    Parameters:
+    - output: The stderr text of the profiled interpreter.
+
+    Returns:
+    - List[ImportRecord]: One record per imported module, in import order.
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def profile(code=None, pytest_args=None):
+    """
+    Runs a fresh interpreter with '-X importtime' and collects its import report.
+
+    Parameters:
+    - code: Python code to run (e.g. 'import conftest').
+    - pytest_args: Arguments for 'pytest --collect-only -q' to profile test collection instead.
+
+    Returns:
+    - List[ImportRecord]: The import records.
+    """
+    command = [sys.executable, "-X", "importtime"]
+    if pytest_args is not None:
+        command += ["-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *pytest_args]
+    else:
+        command += ["-c", code]
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(_project_path),
+                                                                              os.environ.get("PYTHONPATH")])))
+    completed = subprocess.run(command, cwd=_project_path, env=environment, capture_output=True, text=True)
+    if completed.returncode not in (0, 5):
+        sys.stderr.write(completed.stdout + completed.stderr)
+        raise SystemExit(f"Profiled command failed with exit code {completed.returncode}")
+    return parse_importtime(completed.stderr)
+
+
+def _package(name):
+    parts = name.split(".")
+    return ".".join(parts[:2]) if parts[0] == "selenium" else parts[0]
+
+
+def report(records, top):
+    """
+    Prints the most expensive modules and the cost per top-level package.
+
+    Parameters:
+    - records: The import records.
+    - top: Number of modules to list.
+    """
+    total = sum(record.cumulative_us for record in records if record.depth == 0)
+    print(f"total import time: {total / 1000:.1f} ms, {len(records)} modules\n")
+
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for record in sorted(records, key=lambda item: -item.cumulative_us)[:top]:
+        print(f"{record.cumulative_us / 1000:>10.1f}ms {record.self_us / 1000:>8.1f}ms  {record.name}")
+
+    packages = {}
+    for record in records:
+        packages[_package(record.name)] = packages.get(_package(record.name), 0) + record.self_us
+    print(f"\n{'self total':>12}  package")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{self_us / 1000:>10.1f}ms  {package}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help=f"modules to import (default: {', '.join(DEFAULT_MODULES)})")
+    parser.add_argument("--collect", nargs="*", metavar="PYTEST_ARG",
+                        help="profile 'pytest --collect-only' (with optional extra arguments) instead")
+    parser.add_argument("--top", type=int, default=25, help="number of modules to list")
+    args = parser.parse_args(argv)
+
+    if args.collect is not None:
+        records = profile(pytest_args=args.collect)
+    else:
+        records = profile(code="; ".join(f"import {module}" for module in args.modules or DEFAULT_MODULES))
+    report(records, args.top)
+
+
+if __name__ == "__main__":
+    main()
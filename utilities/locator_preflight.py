@@ -0,0 +1,299 @@
+"""
+Offline validation of the locators declared on the page objects.
+
+'capture' walks the product-cart flow in a real browser once and saves the DOM of every page state to
+'locator_snapshots/<PageClass>/<state>.html'. 'check' then evaluates every locator declared on the page objects
+against the snapshots of its page with lxml, without starting a browser, and reports locators that match nothing
+(missing) or several elements (ambiguous).
+
+Usage:
+    python -m utilities.locator_preflight capture
+    python -m utilities.locator_preflight check
+    python -m utilities.locator_preflight check --strict
+"""
+import argparse
+import importlib
+import inspect
+import json
+import pkgutil
+import sys
+import time
+from pathlib import Path
+
+from selenium.webdriver.common.by import By
+
+_project_path = Path(__file__).resolve().parent.parent
+_snapshots_path = _project_path.joinpath("locator_snapshots")
+_env_path = _project_path.joinpath("configurations", "env_1.json")
+
+OK = "ok"
+MISSING = "missing"
+AMBIGUOUS = "ambiguous"
+INVALID = "invalid"
+NO_SNAPSHOT = "no snapshot"
+
+_STRATEGIES = {getattr(By, name) for name in dir(By) if not name.startswith("_")}
+
+
+class LocatorReport:
+    """
+    Result of checking one locator against the snapshots of its page.
+
+    Attributes:
+    - page: The page-object class name.
+    - name: The attribute name of the locator (without name mangling).
+    - locator: The (strategy, value) tuple.
+    - matches: Number of matching elements per snapshot name.
+    - error: The error message if the locator could not be evaluated.
+    """
+
+    def __init__(self, page, name, locator):
+        self.page = page
+        self.name = name
+        self.locator = locator
+        self.matches = {}
+        self.error = None
+
+    @property
+    def status(self):
+        """
+        Returns:
+        - str: OK, MISSING, AMBIGUOUS, INVALID or NO_SNAPSHOT.
+        """
+        if self.error is not None:
+            return INVALID
+        if not self.matches:
+            return NO_SNAPSHOT
+        found = [count for count in self.matches.values() if count]
+        if not found:
+            return MISSING
+        return AMBIGUOUS if max(found) > 1 else OK
+
+
+def declared_locators(page_class):
+    """
+    Lists the locators declared as class attributes of a page object (including private '__name' ones).
+
+    Parameters:
+    - page_class: The page-object class.
+
+    Returns:
+    - List[tuple]: (attribute name, locator) pairs in declaration order.
+    """
+    prefix = f"_{page_class.__name__}"
+    locators = []
+    for name, value in vars(page_class).items():
+        if isinstance(value, tuple) and len(value) == 2 and value[0] in _STRATEGIES and isinstance(value[1], str):
+            locators.append((name[len(prefix):] if name.startswith(prefix + "__") else name, value))
+    return locators
+
+
+def find_page_classes(package="page_objects"):
+    """
+    Finds the page-object classes (BasePage subclasses) defined in a package.
+
+    Parameters:
+    - package: The package to scan.
+
+    Returns:
+    - List[type]: The page-object classes.
+    """
+    from utilities.ui_utilities.base_page import BasePage
+
+    classes = []
+    root = importlib.import_module(package)
+    for module_info in pkgutil.walk_packages(root.__path__, prefix=f"{package}."):
+        module = importlib.import_module(module_info.name)
+        for _, member in inspect.getmembers(module, inspect.isclass):
+            if issubclass(member, BasePage) and member.__module__ == module.__name__:
+                classes.append(member)
+    return classes
+
+
+def count_matches(tree, locator):
+    """
+    Counts the elements of a parsed snapshot matching a Selenium locator.
+
+    Parameters:
+    - tree: The lxml root element of the snapshot.
+    - locator: The (strategy, value) tuple.
+
+    Returns:
+    - int: The number of matching elements.
+    """
+    from lxml.cssselect import CSSSelector
+
+    by, value = locator
+    if by == By.XPATH:
+        result = tree.xpath(value)
+        return len(result) if isinstance(result, list) else int(bool(result))
+    if by == By.CSS_SELECTOR:
+        return len(CSSSelector(value)(tree))
+    if by == By.ID:
+        return len(tree.xpath("//*[@id=$value]", value=value))
+    if by == By.NAME:
+        return len(tree.xpath("//*[@name=$value]", value=value))
+    if by == By.CLASS_NAME:
+        return len(tree.xpath("//*[contains(concat(' ', normalize-space(@class), ' '), $value)]",
+                              value=f" {value} "))
+    if by == By.TAG_NAME:
+        return len(tree.xpath(f"//{value}"))
+    if by == By.LINK_TEXT:
+        return len(tree.xpath("//a[normalize-space(.)=$value]", value=value))
+    if by == By.PARTIAL_LINK_TEXT:
+        return len(tree.xpath("//a[contains(., $value)]", value=value))
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+def load_snapshots(page_name, snapshots_path=_snapshots_path):
+    """
+    Parses the saved snapshots of a page.
+
+    Parameters:
+    - page_name: The page-object class name.
+    - snapshots_path: The snapshots directory.
+
+    Returns:
+    - dict: Parsed lxml root elements keyed by snapshot (state) name.
+    """
+    import lxml.html
+
+    directory = snapshots_path.joinpath(page_name)
+    return {path.stem: lxml.html.document_fromstring(path.read_text(encoding="utf-8"))
+            for path in sorted(directory.glob("*.html"))} if directory.is_dir() else {}
+
+
+def validate(page_classes, snapshots_path=_snapshots_path):
+    """
+    Checks every declared locator against the snapshots of its page.
+
+    Parameters:
+    - page_classes: The page-object classes to check.
+    - snapshots_path: The snapshots directory.
+
+    Returns:
+    - List[LocatorReport]: One report per locator.
+    """
+    from lxml.etree import XPathError
+    from cssselect import SelectorError
+
+    reports = []
+    for page_class in page_classes:
+        snapshots = load_snapshots(page_class.__name__, snapshots_path)
+        for name, locator in declared_locators(page_class):
+            report = LocatorReport(page_class.__name__, name, locator)
+            for state, tree in snapshots.items():
+                try:
+                    report.matches[state] = count_matches(tree, locator)
+                except (XPathError, SelectorError, ValueError) as error:
+                    report.error = f"{type(error).__name__}: {error}"
+                    break
+            reports.append(report)
+    return reports
+
+
+def _settle(seconds):
+    # The flow only needs the DOM at rest for the snapshot, not any particular element.
+    time.sleep(seconds)
+
+
+def capture(env, snapshots_path=_snapshots_path, settle=2.0, headless=True):
+    """
+    Walks the product-cart flow once and saves the DOM of every page state.
+
+    Parameters:
+    - env: The environment configuration (see 'configurations/env_1.json').
+    - snapshots_path: The snapshots directory.
+    - settle: Seconds to let the page settle before each snapshot.
+    - headless: Whether to run the browser headless.
+
+    Returns:
+    - List[Path]: The saved snapshot files.
+    """
+    from page_objects.main_page_pack.main_page import MainPage
+    from utilities.driver_factory import create_driver_factory, create_driver_options
+
+    saved = []
+
+    def snapshot(page_name, state):
+        _settle(settle)
+        path = snapshots_path.joinpath(page_name, f"{state}.html")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(driver.page_source, encoding="utf-8")
+        saved.append(path)
+        print(f"saved {path.relative_to(snapshots_path)}", file=sys.stderr)
+
+    driver = create_driver_factory(env["browser_id"], options=create_driver_options(env["browser_id"], headless))
+    try:
+        driver.set_window_size(1920, 1080)
+        driver.get(env["app_url"])
+        snapshot("MainPage", "home")
+        main_page = MainPage(driver).set_search_text("шуруп")
+        snapshot("MainPage", "search-autocomplete")
+        results = main_page.search("шуруп").get_search_results()
+        snapshot("MainPage", "search-results")
+        product_page = main_page.open_search_result(results.by_id("17717"))
+        snapshot("ProductPage", "product")
+        product_page.set_quantity("5").click_buy_product()
+        snapshot("ProductPage", "minicart")
+        checkout_page = product_page.click_make_order()
+        snapshot("CheckoutPage", "checkout")
+        checkout_page.set_town("Київ")
+        snapshot("CheckoutPage", "town-dropdown")
+        checkout_page.select_town_option()
+        checkout_page.open_delivery_method()
+        snapshot("CheckoutPage", "delivery-dropdown")
+        checkout_page.set_delivery_method()
+        snapshot("CheckoutPage", "delivery-selected")
+        checkout_page.click_add_comment()
+        snapshot("CheckoutPage", "comment")
+    finally:
+        driver.quit()
+    return saved
+
+
+def print_reports(reports, elapsed):
+    """
+    Prints the validation results, problems first.
+
+    Parameters:
+    - reports: The LocatorReports.
+    - elapsed: Validation time in seconds.
+    """
+    order = {INVALID: 0, MISSING: 1, NO_SNAPSHOT: 2, AMBIGUOUS: 3, OK: 4}
+    for report in sorted(reports, key=lambda item: (order[item.status], item.page, item.name)):
+        counts = ", ".join(f"{state}={count}" for state, count in report.matches.items())
+        details = report.error or counts
+        print(f"{report.status.upper():<12} {report.page}.{report.name:<34} {details}")
+        if report.status != OK:
+            print(f"{'':<13}{report.locator[0]}: {report.locator[1]}")
+    totals = {status: sum(report.status == status for report in reports) for status in order}
+    print(f"\n{len(reports)} locators checked in {elapsed * 1000:.0f} ms: "
+          + ", ".join(f"{count} {status}" for status, count in totals.items() if count))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshots", type=Path, default=_snapshots_path, help="snapshots directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    capture_parser = commands.add_parser("capture", help="save DOM snapshots of every page (starts a browser)")
+    capture_parser.add_argument("--settle", type=float, default=2.0, help="seconds to wait before a snapshot")
+    capture_parser.add_argument("--headed", action="store_true", help="show the browser")
+    check_parser = commands.add_parser("check", help="check the locators against the snapshots (no browser)")
+    check_parser.add_argument("--strict", action="store_true", help="treat ambiguous locators as failures")
+    args = parser.parse_args(argv)
+
+    if args.command == "capture":
+        env = json.loads(_env_path.read_text(encoding="utf-8"))
+        capture(env, args.snapshots, args.settle, headless=not args.headed)
+        return 0
+
+    started = time.perf_counter()
+    reports = validate(find_page_classes(), args.snapshots)
+    print_reports(reports, time.perf_counter() - started)
+    failing = {INVALID, MISSING, NO_SNAPSHOT} | ({AMBIGUOUS} if args.strict else set())
+    return 1 if any(report.status in failing for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
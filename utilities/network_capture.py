@@ -0,0 +1,350 @@
+import json
+from collections import OrderedDict, deque
+from contextlib import suppress
+
+from selenium.common import WebDriverException
+
+from utilities.auto_step.auto_step import add_step_listener, remove_step_listener
+from utilities.driver_factory import get_fast_path
+
+BETWEEN_STEPS = "(between steps)"
+
+_BIDI_NETWORK_EVENTS = ["network.beforeRequestSent", "network.responseCompleted", "network.fetchError"]
+
+# Returns the resource timing entries added since the given cursor ({origin, count}); a new document resets
+# the browser's buffer, which shows up as a new time origin.
+_RESOURCE_TIMING_SCRIPT = r"""
+var cursor = arguments[0], origin = performance.timeOrigin;
+if (!window.__networkCaptureBuffer) {
+    performance.setResourceTimingBufferSize(5000);
+    window.__networkCaptureBuffer = true;
+}
+var entries = performance.getEntriesByType("resource");
+var start = cursor && cursor.origin === origin ? cursor.count : 0;
+return {
+    origin: origin,
+    count: entries.length,
+    entries: entries.slice(start).map(function (entry) {
+        return {
+            url: entry.name, type: entry.initiatorType, status: entry.responseStatus || null,
+            start: (origin + entry.startTime) / 1000, end: (origin + entry.responseEnd) / 1000,
+            size: entry.transferSize
+        };
+    })
+};
+"""
+
+
+class RequestRecord:
+    """
+    A single network request seen during a step.
+
+    Attributes:
+    - request_id: The browser's request id.
+    - url: The request URL.
+    - method: The HTTP method (None if the source does not report it).
+    - resource_type: The resource type (xhr, script, document, ...).
+    - status: The HTTP status, or None while unknown.
+    - start: Start time in seconds on the browser clock.
+    - end: End time in seconds on the browser clock, or None while in flight.
+    - size: Transferred bytes, or None.
+    - failed: Error text if the request failed.
+    - step: Name of the autostep step that was running when the request started.
+    """
+
+    def __init__(self, request_id, url, method, resource_type, start, step):
+        self.request_id = request_id
+        self.url = url
+        self.method = method
+        self.resource_type = resource_type
+        self.start = start
+        self.step = step
+        self.status = None
+        self.end = None
+        self.size = None
+        self.failed = None
+
+    @property
+    def duration(self):
+        """
+        Returns:
+        - float or None: The request duration in seconds, or None while in flight.
+        """
+        return None if self.end is None else max(0.0, self.end - self.start)
+
+    def to_dict(self):
+        """
+        Returns:
+        - dict: The record as written to the JSONL log.
+        """
+        return {
+            "step": self.step, "url": self.url, "method": self.method, "type": self.resource_type,
+            "status": self.status, "start": self.start,
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 1),
+            "size": self.size, "failed": self.failed,
+        }
+
+
+class NetworkCapture:
+    """
+    Opt-in capture of browser network traffic tied to the autostep step that was active at the time.
+
+    Sources, in order of preference:
+    - the driver's fast-path websocket: BiDi 'network.*' events on Firefox, CDP 'Network.*' on Chrome;
+    - Chrome's performance log ('Network.*' CDP events, see 'create_driver_options(network_capture=True)');
+    - the Resource Timing API in any other case (finished requests only, no status on older browsers).
+
+    Events are kept in a bounded buffer and sorted into requests at step boundaries. For every top-level step
+    a compact waterfall with the slowest requests is attached to that step in the Allure report, and every
+    request is appended to a JSONL log when a path is given.
+
+    A request still in flight when its step ends is shown as pending in that step's waterfall and logged once
+    it finishes (at a later step boundary or at 'stop'); 'stop' also attaches the list of such requests with
+    their final durations, since they are the slow calls that outlast the step waiting for them.
+
+    Example:
+    capture = NetworkCapture(driver, log_path=Path("network-logs/run.jsonl"), test_name=request.node.nodeid)
+    capture.start()
+    ...
+    capture.stop()
+    """
+
+    def __init__(self, driver, log_path=None, test_name=None, buffer_size=5000, slowest=5):
+        """
+        Initializes the NetworkCapture instance.
+
+        Parameters:
+        - driver: The WebDriver instance.
+        - log_path: Optional path of the JSONL log the requests are appended to.
+        - test_name: Test id written to every JSONL record.
+        - buffer_size: Maximum number of buffered events and of tracked requests.
+        - slowest: Number of slowest requests listed per step.
+        """
+        self._driver = driver
+        self.log_path = log_path
+        self.test_name = test_name
+        self.slowest = slowest
+        self.source = None
+        self.__buffer_size = buffer_size
+        self.__events = deque(maxlen=buffer_size)
+        self.__requests = OrderedDict()
+        self.__fast_path = None
+        self.__timing_cursor = None
+        self.__step = None
+        self.__step_records = []
+        self.__unassigned_records = []
+        self.__unfinished_records = []
+        self.__late_records = []
+        self.__log_file = None
+
+    def start(self):
+        """
+        Selects the event source and starts listening to autostep steps.
+
+        Returns:
+        - self
+        """
+        fast_path = get_fast_path(self._driver)
+        if fast_path is not None:
+            from utilities.fast_path import BIDI, FastPathError
+
+            try:
+                if fast_path.protocol == BIDI:
+                    fast_path.execute("session.subscribe", {"events": _BIDI_NETWORK_EVENTS})
+                else:
+                    fast_path.execute("Network.enable", {})
+                fast_path.add_event_listener(self.__on_event)
+                self.__fast_path, self.source = fast_path, fast_path.protocol
+            except FastPathError:
+                pass
+        if self.source is None:
+            try:
+                self._driver.get_log("performance")
+                self.source = "performance-log"
+            except WebDriverException:
+                self.source = "resource-timing"
+                self.__timing_cursor = self._driver.execute_script(_RESOURCE_TIMING_SCRIPT, None)
+        add_step_listener(self)
+        return self
+
+    def stop(self):
+        """
+        Stops listening and closes the JSONL log.
+        """
+        remove_step_listener(self)
+        self.__collect()
+        self.__log(self.__unassigned_records)
+        if self.__late_records:
+            self.__attach_late(self.__late_records)
+        # Requests that never finished are logged as they are.
+        self.__write_log(self.__unfinished_records)
+        self.__unfinished_records, self.__late_records = [], []
+        if self.__fast_path is not None:
+            self.__fast_path.remove_event_listener(self.__on_event)
+        if self.__log_file is not None:
+            self.__log_file.close()
+            self.__log_file = None
+
+    def __on_event(self, method, params):
+        self.__events.append((method, params))
+
+    def step_started(self, name, depth):
+        """
+        Step listener callback: requests seen so far belong to the previous step or to no step.
+        """
+        if depth == 0:
+            self.__collect()
+            self.__log(self.__unassigned_records)
+            self.__step, self.__step_records, self.__unassigned_records = name, [], []
+
+    def step_finished(self, name, depth, duration, error):
+        """
+        Step listener callback: attaches the waterfall of a finished top-level step and logs its requests.
+        """
+        if depth != 0:
+            return
+        self.__collect()
+        records, self.__step, self.__step_records = self.__step_records, None, []
+        if records:
+            self.__attach(name, duration, records)
+        self.__log(records)
+
+    def __log(self, records):
+        """
+        Logs the finished records, together with earlier records that have finished since they were held back.
+        Records still in flight are held back until they finish or the capture stops.
+        """
+        late = [record for record in self.__unfinished_records if record.end is not None]
+        self.__late_records.extend(record for record in late if record.step != BETWEEN_STEPS)
+        self.__unfinished_records = [record for record in self.__unfinished_records if record.end is None]
+        self.__unfinished_records.extend(record for record in records if record.end is None)
+        self.__write_log(late + [record for record in records if record.end is not None])
+
+    def __collect(self):
+        """
+        Moves the buffered events into request records.
+        """
+        with suppress(WebDriverException):
+            if self.source == "performance-log":
+                for entry in self._driver.get_log("performance"):
+                    message = json.loads(entry["message"])["message"]
+                    self.__events.append((message["method"], message.get("params", {})))
+            elif self.source == "resource-timing":
+                self.__collect_resource_timing()
+        while self.__events:
+            method, params = self.__events.popleft()
+            if method.startswith("Network."):
+                self.__on_cdp_event(method, params)
+            elif method.startswith("network."):
+                self.__on_bidi_event(method, params)
+
+    def __track(self, request_id, url, method, resource_type, start):
+        record = RequestRecord(request_id, url, method, resource_type, start, self.__step or BETWEEN_STEPS)
+        self.__requests[request_id] = record
+        while len(self.__requests) > self.__buffer_size:
+            self.__requests.popitem(last=False)
+        (self.__step_records if self.__step is not None else self.__unassigned_records).append(record)
+        return record
+
+    def __on_cdp_event(self, method, params):
+        request_id = params.get("requestId")
+        record = self.__requests.get(request_id)
+        if method == "Network.requestWillBeSent":
+            if record is not None and "redirectResponse" in params:
+                record.status, record.end = params["redirectResponse"].get("status"), params["timestamp"]
+                self.__requests[f"{request_id}:{record.start}"] = self.__requests.pop(request_id)
+            request = params["request"]
+            self.__track(request_id, request["url"], request.get("method"), params.get("type"), params["timestamp"])
+        elif record is None:
+            return
+        elif method == "Network.responseReceived":
+            record.status = params["response"].get("status")
+        elif method == "Network.loadingFinished":
+            record.end, record.size = params["timestamp"], params.get("encodedDataLength")
+        elif method == "Network.loadingFailed":
+            record.end, record.failed = params["timestamp"], params.get("errorText") or "failed"
+
+    def __on_bidi_event(self, method, params):
+        request = params.get("request", {})
+        request_id = f"{request.get('request')}:{params.get('redirectCount', 0)}"
+        timestamp = params.get("timestamp", 0) / 1000
+        record = self.__requests.get(request_id)
+        if method == "network.beforeRequestSent":
+            self.__track(request_id, request.get("url"), request.get("method"), None, timestamp)
+        elif record is None:
+            return
+        elif method == "network.responseCompleted":
+            response = params.get("response", {})
+            record.end, record.status = timestamp, response.get("status")
+            record.size, record.resource_type = response.get("bytesReceived"), response.get("mimeType")
+        elif method == "network.fetchError":
+            record.end, record.failed = timestamp, params.get("errorText") or "failed"
+
+    def __collect_resource_timing(self):
+        page = self._driver.execute_script(_RESOURCE_TIMING_SCRIPT, self.__timing_cursor)
+        self.__timing_cursor = {"origin": page["origin"], "count": page["count"]}
+        for index, entry in enumerate(page["entries"], start=page["count"] - len(page["entries"])):
+            record = self.__track(f"{page['origin']}:{index}", entry["url"], None, entry["type"], entry["start"])
+            record.end, record.status, record.size = entry["end"], entry["status"], entry["size"]
+
+    def waterfall(self, name, duration, records, width=40):
+        """
+        Renders the requests of a step as a text waterfall followed by the slowest requests.
+
+        Parameters:
+        - name: The step name.
+        - duration: The step duration in seconds.
+        - records: The RequestRecords of the step.
+        - width: Width of the waterfall bars in characters.
+
+        Returns:
+        - str: The rendered waterfall.
+        """
+        origin = min(record.start for record in records)
+        span = max((record.end or record.start) - origin for record in records) or 1e-3
+        lines = [f"{name}: {len(records)} requests, step {duration:.2f}s, network span {span:.2f}s",
+                 f"{'start':>8} {'time':>8} {'status':>6}  {'waterfall':<{width}}  request"]
+        for record in sorted(records, key=lambda item: item.start):
+            offset = record.start - origin
+            first = min(width - 1, int(offset / span * width))
+            last = width if record.end is None else max(first + 1, int((record.end - origin) / span * width))
+            bar = " " * first + ("#" if record.end is not None else ">") * (last - first)
+            time_text = "pending" if record.duration is None else f"{record.duration * 1000:.0f}ms"
+            status = record.failed and "ERR" or record.status or ""
+            lines.append(f"{offset * 1000:>6.0f}ms {time_text:>8} {status!s:>6}  {bar:<{width}}  "
+                         f"{record.method or ''} {record.url}".rstrip())
+        finished = [record for record in records if record.duration is not None]
+        if finished:
+            lines.append("")
+            lines.append(f"slowest {min(self.slowest, len(finished))}:")
+            for record in sorted(finished, key=lambda item: -item.duration)[:self.slowest]:
+                lines.append(f"{record.duration * 1000:>8.0f}ms  {record.method or ''} {record.url}".rstrip())
+        return "\n".join(lines)
+
+    def __attach(self, name, duration, records):
+        import allure
+
+        allure.attach(self.waterfall(name, duration, records), name=f"network: {name}",
+                      attachment_type=allure.attachment_type.TEXT)
+
+    def __attach_late(self, records):
+        import allure
+
+        lines = ["requests that were still pending when their step finished:"]
+        for record in sorted(records, key=lambda item: -item.duration):
+            status = record.failed and "ERR" or record.status or ""
+            lines.append(f"{record.duration * 1000:>8.0f}ms {status!s:>6}  {record.step}  "
+                         f"{record.method or ''} {record.url}".rstrip())
+        allure.attach("\n".join(lines), name="network: requests outlasting their step",
+                      attachment_type=allure.attachment_type.TEXT)
+
+    def __write_log(self, records):
+        if self.log_path is None or not records:
+            return
+        if self.__log_file is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self.__log_file = open(self.log_path, "a", encoding="utf-8")
+        for record in records:
+            line = json.dumps(dict(record.to_dict(), test=self.test_name), ensure_ascii=False)
+            self.__log_file.write(line + "\n")
+        self.__log_file.flush()
@@ -0,0 +1,404 @@
+"""
+Append-only SQLite store of test and step results, with trend queries across runs.
+
+Every test attempt and every autostep step is written as one row (duration, wait time, WebDriver command count,
+retries, outcome) as soon as the test finishes, so a run that is interrupted keeps what it recorded. The queries
+aggregate inside SQLite and never load whole reports into memory.
+
+Usage:
+    python -m utilities.results_store runs
+    python -m utilities.results_store slowest-steps --runs 20 --top 15
+    python -m utilities.results_store flakiness --runs 50
+    python -m utilities.results_store distribution CheckoutPage.set_delivery_method --runs 50
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from utilities.run_info import current_commit, percentile
+
+_project_path = Path(__file__).resolve().parent.parent
+_store_path = _project_path.joinpath("results", "results.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, started_at REAL NOT NULL, commit_id TEXT, label TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL, test TEXT NOT NULL, attempt INTEGER NOT NULL, outcome TEXT NOT NULL,
+    duration REAL NOT NULL, wait_time REAL NOT NULL, commands INTEGER NOT NULL, retries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL, test TEXT NOT NULL, attempt INTEGER NOT NULL, step TEXT NOT NULL,
+    depth INTEGER NOT NULL, outcome TEXT NOT NULL, duration REAL NOT NULL, wait_time REAL NOT NULL,
+    commands INTEGER NOT NULL, retries INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tests_by_run ON tests (run_id, test);
+CREATE INDEX IF NOT EXISTS steps_by_run ON steps (run_id, step);
+"""
+
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class ResultsStore:
+    """
+    The SQLite results database. Rows are only ever appended.
+
+    Tables:
+    - runs: one row per test session (start time, commit, free-form label such as the browser).
+    - tests: one row per test attempt; 'retries' is the number of earlier attempts of the test in the run
+      (flaky reruns).
+    - steps: one row per autostep step ('Class.method'); 'retries' is the number of intercepted-click retries
+      made during the step.
+
+    Example:
+    store = ResultsStore()
+    run_id = store.start_run(label="chrome")
+    for row in store.slowest_steps(runs=20):
+        print(row)
+    """
+
+    def __init__(self, path=_store_path):
+        """
+        Opens (and creates if needed) the database.
+
+        Parameters:
+        - path: The SQLite file.
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path))
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def start_run(self, label=None, commit_id=None):
+        """
+        Registers a new run.
+
+        Parameters:
+        - label: Free-form description of the run (e.g. the browser).
+        - commit_id: The commit tested (default: the current git HEAD).
+
+        Returns:
+        - int: The run id.
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (started_at, commit_id, label) VALUES (?, ?, ?)",
+                (time.time(), commit_id or current_commit(), label))
+        return cursor.lastrowid
+
+    def append(self, run_id, test, steps):
+        """
+        Appends one test attempt and its steps in a single transaction.
+
+        Parameters:
+        - run_id: The run id.
+        - test: (test, attempt, outcome, duration, wait_time, commands, retries).
+        - steps: (step, depth, outcome, duration, wait_time, commands, retries) rows.
+        """
+        name, attempt = test[0], test[1]
+        with self._connection:
+            self._connection.execute("INSERT INTO tests VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (run_id, *test))
+            self._connection.executemany("INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                         [(run_id, name, attempt, *step) for step in steps])
+
+    def __last_runs(self, runs):
+        return "run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (runs,)
+
+    def runs(self, last=10):
+        """
+        Parameters:
+        - last: Number of runs to list.
+
+        Returns:
+        - List[tuple]: (id, started_at, commit_id, label, tests, failed attempts, total duration), newest first.
+        """
+        return self._connection.execute("""
+            SELECT runs.id, runs.started_at, runs.commit_id, runs.label, COUNT(DISTINCT tests.test),
+                   COALESCE(SUM(tests.outcome = 'failed'), 0), COALESCE(SUM(tests.duration), 0)
+            FROM runs LEFT JOIN tests ON tests.run_id = runs.id
+            GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?""", (last,)).fetchall()
+
+    def slowest_steps(self, runs=20, top=15, depth=None):
+        """
+        Parameters:
+        - runs: Number of most recent runs to include.
+        - top: Number of steps to return.
+        - depth: Only steps of this nesting depth (0 for steps called from the test), or all.
+
+        Returns:
+        - List[tuple]: (step, calls, mean duration, max duration, mean wait time, mean commands), slowest
+          mean first.
+        """
+        where, parameters = self.__last_runs(runs)
+        if depth is not None:
+            where, parameters = f"{where} AND depth = ?", parameters + (depth,)
+        return self._connection.execute(f"""
+            SELECT step, COUNT(*), AVG(duration), MAX(duration), AVG(wait_time), AVG(commands)
+            FROM steps WHERE {where}
+            GROUP BY step ORDER BY AVG(duration) DESC LIMIT ?""", parameters + (top,)).fetchall()
+
+    def step_flakiness(self, runs=50):
+        """
+        Parameters:
+        - runs: Number of most recent runs to include.
+
+        Returns:
+        - List[tuple]: (step, calls, failures, failure rate, runs with a failure) for every page-object method
+          that failed at least once, highest rate first.
+        """
+        where, parameters = self.__last_runs(runs)
+        return self._connection.execute(f"""
+            SELECT step, COUNT(*), SUM(outcome = 'failed'), AVG(outcome = 'failed'),
+                   COUNT(DISTINCT CASE WHEN outcome = 'failed' THEN run_id END)
+            FROM steps WHERE {where}
+            GROUP BY step HAVING SUM(outcome = 'failed') > 0
+            ORDER BY AVG(outcome = 'failed') DESC, step""", parameters).fetchall()
+
+    def test_flakiness(self, runs=50):
+        """
+        Parameters:
+        - runs: Number of most recent runs to include.
+
+        Returns:
+        - List[tuple]: (test, runs, flaky runs, failed runs, flaky rate): a run is flaky when the test failed
+          and then passed on a retry, failed when no attempt passed. Highest flaky rate first.
+        """
+        where, parameters = self.__last_runs(runs)
+        return self._connection.execute(f"""
+            SELECT test, COUNT(*), SUM(passed AND failed), SUM(NOT passed AND failed),
+                   AVG(passed AND failed)
+            FROM (SELECT test, run_id, MAX(outcome = 'passed') AS passed, MAX(outcome = 'failed') AS failed
+                  FROM tests WHERE {where} GROUP BY test, run_id)
+            GROUP BY test ORDER BY AVG(passed AND failed) DESC, test""", parameters).fetchall()
+
+    def durations(self, step, runs=50, outcome=PASSED):
+        """
+        Streams the durations of one step in ascending order.
+
+        Parameters:
+        - step: The step name ('Class.method').
+        - runs: Number of most recent runs to include.
+        - outcome: Only calls with this outcome, or None for all.
+
+        Yields:
+        - float: Durations in seconds.
+        """
+        where, parameters = self.__last_runs(runs)
+        if outcome is not None:
+            where, parameters = f"{where} AND outcome = ?", parameters + (outcome,)
+        for (duration,) in self._connection.execute(
+                f"SELECT duration FROM steps WHERE step = ? AND {where} ORDER BY duration", (step, *parameters)):
+            yield duration
+
+
+class ResultsRecorder:
+    """
+    Collects the steps, waits and WebDriver commands of the running test and appends them to a ResultsStore
+    when the test finishes.
+
+    Registered as an autostep step listener and a BasePage wait listener; 'watch' counts the commands of a
+    driver. Wait time and commands are added to every step open at the time, so a step includes its sub-steps.
+
+    Example:
+    recorder = ResultsRecorder(ResultsStore(), label="chrome").start()
+    recorder.start_test("tests/ui_tests/test_product_cart.py::test_adding_product_to_cart_valid_data")
+    ...
+    recorder.finish_test("passed", 42.0)
+    recorder.stop()
+    """
+
+    def __init__(self, store, label=None):
+        """
+        Initializes the ResultsRecorder instance.
+
+        Parameters:
+        - store: The ResultsStore to write to.
+        - label: Label of the run (e.g. the browser).
+        """
+        self.store = store
+        self.label = label
+        self.run_id = None
+        self.__attempts = {}
+        self.__test = None
+        self.__open_steps = []
+        self.__steps = []
+
+    def start(self):
+        """
+        Registers the run and starts listening to steps and waits.
+
+        Returns:
+        - self
+        """
+        from utilities.auto_step.auto_step import add_step_listener
+        from utilities.ui_utilities.base_page import add_wait_listener
+
+        self.run_id = self.store.start_run(self.label)
+        add_step_listener(self)
+        add_wait_listener(self)
+        return self
+
+    def stop(self):
+        """
+        Stops listening.
+        """
+        from utilities.auto_step.auto_step import remove_step_listener
+        from utilities.ui_utilities.base_page import remove_wait_listener
+
+        remove_step_listener(self)
+        remove_wait_listener(self)
+
+    def watch(self, driver):
+        """
+        Counts the WebDriver commands the driver sends from now on.
+
+        Parameters:
+        - driver: The WebDriver instance.
+        """
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.__count("commands", 1)
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+
+    def __count(self, field, amount):
+        if self.__test is not None:
+            self.__test[field] += amount
+        for step in self.__open_steps:
+            step[field] += amount
+
+    @staticmethod
+    def __click_retries():
+        from utilities.ui_utilities.animations import click_retry_stats
+
+        return sum(totals[2] for totals in click_retry_stats.totals.values())
+
+    def start_test(self, test):
+        """
+        Starts collecting for a test attempt.
+
+        Parameters:
+        - test: The test id (pytest node id).
+        """
+        attempt = self.__attempts.get(test, 0) + 1
+        self.__attempts[test] = attempt
+        self.__test = {"name": test, "attempt": attempt, "wait_time": 0.0, "commands": 0}
+        self.__open_steps, self.__steps = [], []
+
+    def finish_test(self, outcome, duration):
+        """
+        Appends the test attempt and its steps to the store.
+
+        Parameters:
+        - outcome: 'passed', 'failed' or 'skipped'.
+        - duration: The test duration in seconds.
+        """
+        if self.__test is None:
+            return
+        test, self.__test = self.__test, None
+        self.store.append(self.run_id, (test["name"], test["attempt"], outcome, duration, test["wait_time"],
+                                        test["commands"], test["attempt"] - 1), self.__steps)
+        self.__open_steps, self.__steps = [], []
+
+    def step_started(self, name, depth):
+        """
+        Step listener callback.
+        """
+        if self.__test is not None:
+            self.__open_steps.append({"depth": depth, "wait_time": 0.0, "commands": 0,
+                                      "retries": self.__click_retries()})
+
+    def step_finished(self, name, depth, duration, error):
+        """
+        Step listener callback: keeps the finished step for 'finish_test'.
+        """
+        if self.__test is None or not self.__open_steps:
+            return
+        step = self.__open_steps.pop()
+        self.__steps.append((name, depth, PASSED if error is None else FAILED, duration, step["wait_time"],
+                             step["commands"], self.__click_retries() - step["retries"]))
+
+    def wait_finished(self, page, condition, locator, elapsed, outcome):
+        """
+        Wait listener callback: adds the wait to the test and its open steps.
+        """
+        self.__count("wait_time", elapsed)
+
+
+def _print_table(header, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(header, *rows)]
+    for row in [header, *rows]:
+        print("  ".join(str(value).rjust(width) if index else str(value).ljust(width)
+                        for index, (value, width) in enumerate(zip(row, widths))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", type=Path, default=_store_path, help="results database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    runs_parser = commands.add_parser("runs", help="list the latest runs")
+    runs_parser.add_argument("--last", type=int, default=10)
+    slowest_parser = commands.add_parser("slowest-steps", help="slowest page-object steps over the last runs")
+    slowest_parser.add_argument("--runs", type=int, default=20)
+    slowest_parser.add_argument("--top", type=int, default=15)
+    slowest_parser.add_argument("--depth", type=int, help="only steps of this depth (0: called from the test)")
+    flakiness_parser = commands.add_parser("flakiness", help="failure rate per page-object method and per test")
+    flakiness_parser.add_argument("--runs", type=int, default=50)
+    distribution_parser = commands.add_parser("distribution", help="duration distribution of one step")
+    distribution_parser.add_argument("step", help="step name, e.g. CheckoutPage.set_delivery_method")
+    distribution_parser.add_argument("--runs", type=int, default=50)
+    distribution_parser.add_argument("--buckets", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if not args.path.exists():
+        raise SystemExit(f"No results store at {args.path}")
+    store = ResultsStore(args.path)
+    if args.command == "runs":
+        _print_table(("run", "started", "commit", "label", "tests", "failed", "duration"),
+                     [(run_id, time.strftime("%Y-%m-%d %H:%M", time.localtime(started)), commit or "-",
+                       label or "-", tests, failed, f"{duration:.1f}s")
+                      for run_id, started, commit, label, tests, failed, duration in store.runs(args.last)])
+    elif args.command == "slowest-steps":
+        _print_table(("step", "calls", "mean", "max", "wait", "commands"),
+                     [(step, calls, f"{mean:.2f}s", f"{longest:.2f}s", f"{wait:.2f}s", f"{commands:.1f}")
+                      for step, calls, mean, longest, wait, commands in store.slowest_steps(args.runs, args.top,
+                                                                                            args.depth)])
+    elif args.command == "flakiness":
+        _print_table(("step", "calls", "failures", "rate", "runs"),
+                     [(step, calls, failures, f"{rate:.1%}", failed_runs)
+                      for step, calls, failures, rate, failed_runs in store.step_flakiness(args.runs)])
+        print()
+        _print_table(("test", "runs", "flaky", "failed", "flaky rate"),
+                     [(test, runs, flaky, failed, f"{rate:.1%}")
+                      for test, runs, flaky, failed, rate in store.test_flakiness(args.runs)])
+    else:
+        ordered = list(store.durations(args.step, args.runs))
+        if not ordered:
+            raise SystemExit(f"No passed calls of {args.step} in the last {args.runs} runs")
+        print(f"{args.step}: {len(ordered)} passed calls, "
+              + ", ".join(f"p{int(fraction * 100)} {percentile(ordered, fraction):.2f}s"
+                          for fraction in (0.5, 0.9, 0.95, 0.99)) + f", max {ordered[-1]:.2f}s")
+        width = (ordered[-1] - ordered[0]) / args.buckets or 1.0
+        counts = [0] * args.buckets
+        for duration in ordered:
+            counts[min(args.buckets - 1, int((duration - ordered[0]) / width))] += 1
+        for index, count in enumerate(counts):
+            low = ordered[0] + index * width
+            print(f"{low:>8.2f}s - {low + width:>6.2f}s  {count:>5}  {'#' * round(count / max(counts) * 40)}")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import math
+import subprocess
+from pathlib import Path
+
+_project_path = Path(__file__).resolve().parent.parent
+
+
+def current_commit():
+    """
+    Get the short id of the checked-out git commit.
+
+    Returns:
+    - str or None: The commit id, or None outside a git checkout (or without git).
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=_project_path).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(samples, fraction):
+    """
+    Nearest-rank percentile, shared by the benchmark summaries, the learned wait timeouts and the results store.
+
+    Parameters:
+    - samples: The values (need not be sorted).
+    - fraction: The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+    - float: The percentile value.
+    """
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
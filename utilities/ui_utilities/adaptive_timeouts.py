@@ -0,0 +1,258 @@
+"""
+Adaptive per-locator wait timeouts and poll intervals learned from the wait durations of earlier runs.
+
+Every element wait of a page object is recorded per (page class, condition, locator). Once a locator has enough
+samples, its waits use p99 x safety factor (within a floor and a cap) instead of the fixed timeout, and a poll
+interval derived from its median, so waits that normally finish in 200 ms fail fast when they are stuck while
+slow AJAX widgets keep the time they need.
+
+Review the learned table with:
+    python -m utilities.ui_utilities.adaptive_timeouts
+    python -m utilities.ui_utilities.adaptive_timeouts --page CheckoutPage --all
+"""
+import argparse
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from utilities.run_info import percentile
+
+_project_path = Path(__file__).resolve().parent.parent.parent
+_history_path = _project_path.joinpath("wait-history", "history.json")
+
+_active_history = None
+
+
+class LearnedWait:
+    """
+    Wait history of one (page class, condition, locator) and the settings learned from it.
+
+    Attributes:
+    - page: The page-object class name.
+    - condition: The wait condition (visible, invisible, clickable, present).
+    - locator: The (strategy, value) tuple.
+    - durations: The most recent wait durations in seconds, oldest first. Timed-out waits are kept with the
+      time they waited, so a learned timeout that turns out too short grows on the next run.
+    - timeouts: Number of timed-out waits ever recorded.
+    """
+
+    def __init__(self, page, condition, locator, durations=None, timeouts=0):
+        self.page = page
+        self.condition = condition
+        self.locator = tuple(locator)
+        self.durations = list(durations or [])
+        self.timeouts = timeouts
+
+    @property
+    def key(self):
+        return self.page, self.condition, self.locator
+
+    def to_dict(self):
+        """
+        Returns:
+        - dict: The entry as stored in the history file.
+        """
+        return {"page": self.page, "condition": self.condition, "by": self.locator[0], "value": self.locator[1],
+                "durations": [round(duration, 3) for duration in self.durations], "timeouts": self.timeouts}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["page"], data["condition"], (data["by"], data["value"]), data["durations"],
+                   data.get("timeouts", 0))
+
+
+class TimeoutHistory:
+    """
+    Persistent wait durations per (page class, condition, locator) and the timeouts learned from them.
+
+    The learned timeout is p99 of the recorded durations times 'safety_factor', kept between 'min_timeout' and
+    'max_timeout'; the poll interval is the median divided by 'poll_divisor', kept between 'min_poll' and
+    'max_poll'. Locators with fewer than 'min_samples' durations keep the timeout their caller asks for.
+
+    Attributes:
+    - path: The JSON history file.
+    - safety_factor, min_timeout, max_timeout: How the timeout is derived from p99 (seconds).
+    - poll_divisor, min_poll, max_poll: How the poll interval is derived from the median (seconds).
+    - min_samples: Durations needed before a locator's settings are learned.
+    - max_samples: Durations kept per locator (the most recent ones).
+
+    Example:
+    history = TimeoutHistory.load(Path("wait-history/history.json"))
+    with use_timeout_history(history):
+        ...
+    history.save()
+    """
+    safety_factor = 3.0
+    min_timeout = 2.0
+    max_timeout = 60.0
+    poll_divisor = 5.0
+    min_poll = 0.05
+    max_poll = 0.5
+    min_samples = 20
+    max_samples = 200
+
+    def __init__(self, path=_history_path, entries=()):
+        """
+        Initializes the TimeoutHistory instance.
+
+        Parameters:
+        - path: The JSON history file.
+        - entries: LearnedWait entries loaded from the file.
+        """
+        self.path = path
+        self.__entries = {entry.key: entry for entry in entries}
+        self.__new_durations = {}
+        self.__new_timeouts = {}
+
+    @classmethod
+    def load(cls, path=_history_path):
+        """
+        Loads the history file, or starts an empty history if it does not exist yet.
+
+        Parameters:
+        - path: The JSON history file.
+
+        Returns:
+        - TimeoutHistory: The loaded history.
+        """
+        return cls(path, cls.__read(path))
+
+    @staticmethod
+    def __read(path):
+        if not path.exists():
+            return []
+        return [LearnedWait.from_dict(data) for data in json.loads(path.read_text(encoding="utf-8"))["waits"]]
+
+    def __entry(self, page, condition, locator):
+        key = (page, condition, tuple(locator))
+        if key not in self.__entries:
+            self.__entries[key] = LearnedWait(page, condition, locator)
+        return self.__entries[key]
+
+    def record(self, page, condition, locator, elapsed, outcome):
+        """
+        Records a finished wait.
+
+        Parameters:
+        - page: The page-object class name.
+        - condition: The wait condition.
+        - locator: The (strategy, value) tuple.
+        - elapsed: Seconds the wait took.
+        - outcome: 'ok' or 'timeout'.
+        """
+        entry = self.__entry(page, condition, locator)
+        entry.durations = (entry.durations + [elapsed])[-self.max_samples:]
+        self.__new_durations.setdefault(entry.key, []).append(elapsed)
+        if outcome == "timeout":
+            entry.timeouts += 1
+            self.__new_timeouts[entry.key] = self.__new_timeouts.get(entry.key, 0) + 1
+
+    def learned(self, page, condition, locator):
+        """
+        Parameters:
+        - page: The page-object class name.
+        - condition: The wait condition.
+        - locator: The (strategy, value) tuple.
+
+        Returns:
+        - tuple or None: (timeout, poll interval) in seconds, or None while there are too few samples.
+        """
+        entry = self.__entries.get((page, condition, tuple(locator)))
+        if entry is None or len(entry.durations) < self.min_samples:
+            return None
+        timeout = percentile(entry.durations, 0.99) * self.safety_factor
+        poll = percentile(entry.durations, 0.5) / self.poll_divisor
+        return (min(self.max_timeout, max(self.min_timeout, timeout)),
+                min(self.max_poll, max(self.min_poll, poll)))
+
+    def table(self):
+        """
+        Returns:
+        - List[tuple]: (LearnedWait, (timeout, poll) or None) for every recorded locator.
+        """
+        return [(entry, self.learned(*entry.key)) for entry in self.__entries.values()]
+
+    def save(self):
+        """
+        Writes the history, merging the waits of this run into the current file content so that runs finishing
+        in parallel do not drop each other's samples.
+        """
+        merged = {entry.key: entry for entry in self.__read(self.path)}
+        for key, durations in self.__new_durations.items():
+            entry = merged.setdefault(key, LearnedWait(*key))
+            entry.durations = (entry.durations + durations)[-self.max_samples:]
+            entry.timeouts += self.__new_timeouts.get(key, 0)
+        self.__entries = merged
+        self.__new_durations, self.__new_timeouts = {}, {}
+        waits = sorted((entry.to_dict() for entry in merged.values()),
+                       key=lambda data: (data["page"], data["condition"], data["by"], data["value"]))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps({"waits": waits}, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+
+def current_timeout_history():
+    """
+    Returns:
+    - TimeoutHistory or None: The active history, if adaptive timeouts are enabled.
+    """
+    return _active_history
+
+
+@contextmanager
+def use_timeout_history(history):
+    """
+    Activates a history for the duration of the block: waits are recorded into it and use its learned timeouts.
+
+    Parameters:
+    - history: The TimeoutHistory.
+
+    Yields:
+    - TimeoutHistory: The active history.
+    """
+    global _active_history
+    previous, _active_history = _active_history, history
+    try:
+        yield history
+    finally:
+        _active_history = previous
+
+
+def print_table(history, page=None, show_all=False):
+    """
+    Prints the learned timeouts, slowest first.
+
+    Parameters:
+    - history: The TimeoutHistory.
+    - page: Only list the locators of this page class.
+    - show_all: Also list locators that do not have enough samples yet.
+    """
+    rows = [(entry, learned) for entry, learned in history.table() if page is None or entry.page == page]
+    listed = [(entry, learned) for entry, learned in rows if learned is not None or show_all]
+    print(f"{'timeout':>8} {'poll':>6} {'p50':>7} {'p99':>7} {'max':>7} {'n':>4} {'t/o':>4}  "
+          f"{'condition':<9}  locator")
+    for entry, learned in sorted(listed, key=lambda row: -percentile(row[0].durations, 0.99)):
+        timeout, poll = (f"{learned[0]:.1f}s", f"{learned[1]:.2f}s") if learned else ("-", "-")
+        print(f"{timeout:>8} {poll:>6} {percentile(entry.durations, 0.5):>6.2f}s "
+              f"{percentile(entry.durations, 0.99):>6.2f}s {max(entry.durations):>6.2f}s "
+              f"{len(entry.durations):>4} {entry.timeouts:>4}  {entry.condition:<9}  "
+              f"{entry.page} {entry.locator[0]}: {entry.locator[1]}")
+    print(f"\n{sum(learned is not None for _, learned in rows)} learned, "
+          f"{sum(learned is None for _, learned in rows)} with fewer than {history.min_samples} samples"
+          f"{'' if show_all else ' (not listed, use --all)'}; "
+          f"timeout = p99 x {history.safety_factor:g} within {history.min_timeout:g}-{history.max_timeout:g}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", type=Path, default=_history_path, help="history file")
+    parser.add_argument("--page", help="only list the locators of this page class")
+    parser.add_argument("--all", action="store_true", help="also list locators without enough samples")
+    args = parser.parse_args(argv)
+    print_table(TimeoutHistory.load(args.path), args.page, args.all)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import weakref
+
+PRELOAD = "preload"
+INJECTION = "injection"
+
+_suppressed_drivers = weakref.WeakKeyDictionary()
+
+# Disables CSS transitions, CSS animations, smooth scrolling and jQuery animations in the current document.
+# Runs before the page's own scripts when registered as a preload script, so it cannot rely on <head> or jQuery
+# existing yet: the stylesheet waits for the root element and jQuery.fx.off is set as soon as jQuery is assigned.
+# Durations are cut to 1ms rather than 0 so that transitions still run: a 0s transition never starts and never
+# fires 'transitionend', which widgets such as Magento's modal wait for before removing the dialog and its overlay.
+DISABLE_ANIMATIONS_SCRIPT = r"""
+(function () {
+    if (window.__animationsDisabled) { return; }
+    window.__animationsDisabled = true;
+    var css = "*, *::before, *::after {" +
+        "transition-duration: 1ms !important; transition-delay: 0s !important;" +
+        "animation-duration: 1ms !important; animation-delay: 0s !important;" +
+        "animation-iteration-count: 1 !important; scroll-behavior: auto !important;}";
+
+    function addStyle() {
+        var root = document.head || document.documentElement;
+        if (!root) { return false; }
+        var style = document.createElement("style");
+        style.id = "__animations-disabled";
+        style.textContent = css;
+        root.appendChild(style);
+        return true;
+    }
+
+    if (!addStyle()) {
+        new MutationObserver(function (mutations, observer) {
+            if (addStyle()) { observer.disconnect(); }
+        }).observe(document, {childList: true});
+    }
+
+    function fxOff(jQuery) {
+        if (jQuery && jQuery.fx) { jQuery.fx.off = true; }
+    }
+
+    var current = window.jQuery;
+    fxOff(current);
+    try {
+        Object.defineProperty(window, "jQuery", {
+            configurable: true,
+            get: function () { return current; },
+            set: function (value) { current = value; fxOff(value); }
+        });
+    } catch (error) {
+        // Not configurable on this page; the DOMContentLoaded hook below still covers it.
+    }
+    document.addEventListener("DOMContentLoaded", function () { fxOff(window.jQuery); });
+})();
+"""
+
+
+def disable_animations(driver):
+    """
+    Disables transitions, animations, smooth scrolling and jQuery animations in every document the driver loads.
+
+    Chrome registers the script with CDP 'Page.addScriptToEvaluateOnNewDocument' and Firefox with BiDi
+    'script.addPreloadScript' when the driver has a BiDi fast path; both run it before the page's own scripts.
+    Otherwise the script is injected into the current document before every element wait of a page object
+    (see 'reapply_animation_suppression'), which also covers documents loaded after the page object was created.
+
+    Parameters:
+    - driver: The WebDriver instance.
+
+    Returns:
+    - str: How the script is applied, PRELOAD or INJECTION.
+    """
+    from selenium.common import WebDriverException
+
+    from utilities.driver_factory import get_fast_path
+
+    mode = INJECTION
+    fast_path = get_fast_path(driver)
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_SCRIPT})
+            mode = PRELOAD
+        except WebDriverException:
+            pass
+    elif fast_path is not None:
+        from utilities.fast_path import BIDI, FastPathError
+
+        if fast_path.protocol == BIDI:
+            try:
+                fast_path.execute("script.addPreloadScript",
+                                  {"functionDeclaration": f"() => {{{DISABLE_ANIMATIONS_SCRIPT}}}"})
+                mode = PRELOAD
+            except FastPathError:
+                pass
+    _suppressed_drivers[driver] = mode
+    return mode
+
+
+def animations_disabled(driver):
+    """
+    Parameters:
+    - driver: The WebDriver instance.
+
+    Returns:
+    - bool: Whether 'disable_animations' was applied to the driver.
+    """
+    return driver in _suppressed_drivers
+
+
+def reapply_animation_suppression(driver):
+    """
+    Injects the suppression script into the current document if the driver has no preload script for it.
+    The script is idempotent, so documents that already have it are left alone; drivers without the mode or with a
+    preload script cost no command.
+
+    Parameters:
+    - driver: The WebDriver instance.
+    """
+    if _suppressed_drivers.get(driver) == INJECTION:
+        from selenium.common import WebDriverException
+
+        try:
+            driver.execute_script(DISABLE_ANIMATIONS_SCRIPT)
+        except WebDriverException:
+            # The document is being replaced; the next wait injects into the new one.
+            pass
+
+
+class ClickRetryStats:
+    """
+    Time spent retrying intercepted clicks ('BasePage.wait_for_element_clickable_and_click'), kept separately
+    for drivers with and without animation suppression so the two can be compared.
+
+    Attributes:
+    - totals: {animations disabled (bool): [clicks, retried clicks, retries, seconds spent retrying]}.
+    """
+
+    def __init__(self):
+        self.totals = {}
+
+    def record(self, animations_off, retries, seconds):
+        """
+        Records a finished click.
+
+        Parameters:
+        - animations_off: Whether animation suppression was active for the driver.
+        - retries: Number of intercepted attempts before the click went through (or gave up).
+        - seconds: Time from the first intercepted attempt to the end of the click.
+        """
+        totals = self.totals.setdefault(animations_off, [0, 0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += retries > 0
+        totals[2] += retries
+        totals[3] += seconds
+
+    def summary(self):
+        """
+        Returns:
+        - List[str]: One line per mode that saw clicks.
+        """
+        lines = []
+        for animations_off, (clicks, retried, retries, seconds) in sorted(self.totals.items()):
+            mode = "animations disabled" if animations_off else "animations enabled"
+            lines.append(f"click retries ({mode}): {retried} of {clicks} clicks intercepted, {retries} retries, "
+                         f"{seconds:.2f}s spent retrying")
+        return lines
+
+
+click_retry_stats = ClickRetryStats()
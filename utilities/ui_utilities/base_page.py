@@ -1,12 +1,42 @@
 import time
 
-from selenium.common import TimeoutException, NoSuchElementException, ElementClickInterceptedException
-from selenium.webdriver import Keys
+from selenium.common import TimeoutException, NoSuchElementException, ElementClickInterceptedException, \
+    StaleElementReferenceException
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.common.keys import Keys
 import re
 
+from utilities.driver_factory import get_fast_path
+from utilities.ui_utilities.adaptive_timeouts import current_timeout_history
+from utilities.ui_utilities.animations import animations_disabled, click_retry_stats, \
+    reapply_animation_suppression
+from utilities.ui_utilities.wait_budget import WaitBudgetExceeded, current_budget
+from utilities.ui_utilities.wait_engines import CLICKABLE, INVISIBLE, PRESENT, VISIBLE, create_wait_engine
+
+_wait_listeners = []
+
+
+def add_wait_listener(listener):
+    """
+    Registers an object notified about every element wait of the page objects.
+
+    Parameters:
+    - listener: An object with a 'wait_finished(page, condition, locator, elapsed, outcome)' method; 'page' is
+      the page-object class name and 'outcome' is 'ok' or 'timeout'.
+    """
+    _wait_listeners.append(listener)
+
+
+def remove_wait_listener(listener):
+    """
+    Unregisters a listener added with 'add_wait_listener'.
+
+    Parameters:
+    - listener: The listener to remove.
+    """
+    if listener in _wait_listeners:
+        _wait_listeners.remove(listener)
+
 
 class BasePage:
     """
@@ -14,9 +44,14 @@ class BasePage:
 
     Attributes:
     - _driver: The WebDriver instance for interacting with the web page.
-    - _wait: WebDriverWait instance for explicit waits.
+    - _wait: WebDriverWait instance for explicit waits (created on first use).
+    - _wait_engine: The engine all element waits go through (see 'wait_engine').
+    - wait_engine: Name of the wait engine used by every page: 'polling' (WebDriverWait) or 'observer'
+      (in-browser MutationObserver, one round trip per wait). Set from the 'wait_engine' env option.
 
     """
+    wait_engine = "polling"
+
     def __init__(self, driver):
         """
         Initializes the BasePage instance.
@@ -25,7 +60,110 @@ class BasePage:
         - driver: The WebDriver instance for interacting with the web page.
         """
         self._driver = driver
-        self._wait = WebDriverWait(self._driver, 60)
+        self.__explicit_wait = None
+        self._wait_engine = create_wait_engine(self.wait_engine, self._driver, 60)
+
+    @property
+    def _wait(self):
+        """
+        WebDriverWait instance for explicit waits, created on first use so that pages which only go through
+        the wait engine never import the wait support module.
+        """
+        if self.__explicit_wait is None:
+            from selenium.webdriver.support.wait import WebDriverWait
+
+            self.__explicit_wait = WebDriverWait(self._driver, 60)
+        return self.__explicit_wait
+
+    def __wait(self, condition, locator, timeout=None, read=None, default_timeout=60):
+        """
+        Waits for the condition through the wait engine, using the locator's learned timeout and poll interval if
+        adaptive timeouts are enabled and drawing the timeout from the test's wait budget if one is active.
+        Wait listeners (see 'add_wait_listener') are notified once the wait is over.
+
+        Parameters:
+        - condition: One of VISIBLE, INVISIBLE, CLICKABLE or PRESENT.
+        - locator: A tuple representing the locator strategy and value.
+        - timeout: Maximum time to wait in seconds, or None for the locator's learned timeout (if any) and
+          otherwise 'default_timeout'. An active budget caps either.
+        - read: What the caller needs instead of the element: 'text', an attribute name, or True for only
+          whether the condition holds. Such waits can be served by the driver's fast path in one message.
+        - default_timeout: Timeout in seconds when none is given and nothing was learned for the locator.
+
+        Returns:
+        - The value returned by the wait engine, or the value read.
+
+        Raises:
+        - TimeoutException: If the condition does not hold within the timeout.
+        - WaitBudgetExceeded: If the wait used up the rest of the test's wait budget.
+        """
+        reapply_animation_suppression(self._driver)
+        budget = current_budget()
+        history = current_timeout_history()
+        if budget is None and history is None and not _wait_listeners:
+            return self.__wait_and_read(condition, locator, default_timeout if timeout is None else timeout, read)
+        page = type(self).__name__
+        label = f"{page} {locator}"
+        poll = None
+        learned = history.learned(page, condition, locator) if history is not None and timeout is None else None
+        if learned is not None:
+            timeout, poll = learned
+        elif timeout is None:
+            timeout = default_timeout
+        if budget is not None:
+            timeout = budget.timeout_for(timeout, label)
+        started = time.monotonic()
+        try:
+            result = self.__wait_and_read(condition, locator, timeout, read, poll)
+        except TimeoutException as error:
+            elapsed = time.monotonic() - started
+            for listener in list(_wait_listeners):
+                listener.wait_finished(page, condition, locator, elapsed, "timeout")
+            if history is not None:
+                history.record(page, condition, locator, elapsed, "timeout")
+            if budget is not None:
+                budget.record(label, condition, elapsed, "timeout")
+                if budget.is_exhausted():
+                    raise WaitBudgetExceeded(budget.breakdown(f"Wait budget exhausted waiting for {label} to be "
+                                                              f"{condition}")) from error
+            raise
+        elapsed = time.monotonic() - started
+        for listener in list(_wait_listeners):
+            listener.wait_finished(page, condition, locator, elapsed, "ok")
+        if history is not None:
+            history.record(page, condition, locator, elapsed, "ok")
+        if budget is not None:
+            budget.record(label, condition, elapsed, "ok")
+        return result
+
+    def __wait_and_read(self, condition, locator, timeout, read, poll=None):
+        """
+        Performs the wait (and read) over the fast path when possible, otherwise with WebDriver HTTP commands.
+
+        Parameters:
+        - condition: One of VISIBLE, INVISIBLE, CLICKABLE or PRESENT.
+        - locator: A tuple representing the locator strategy and value.
+        - timeout: Maximum time to wait in seconds, the fast path and a fallback to WebDriver commands together.
+        - read: See '__wait'.
+        - poll: Poll interval in seconds, or None for the engine's default.
+
+        Returns:
+        - The value returned by the wait engine, or the value read.
+        """
+        fast_path = get_fast_path(self._driver)
+        if fast_path is not None and (read is not None or condition == INVISIBLE):
+            from utilities.fast_path import FastPathError
+
+            deadline = time.monotonic() + timeout
+            try:
+                return fast_path.wait_and_read(condition, locator, timeout, None if read is True else read, poll)
+            except FastPathError:
+                # Only the time left goes to the WebDriver wait; with none left it still checks once.
+                timeout = max(0.0, deadline - time.monotonic())
+        result = self._wait_engine.until(condition, locator, timeout=timeout, poll=poll)
+        if read is None or read is True:
+            return result
+        return result.text if read == "text" else result.get_attribute(read)
 
     def __wait_until_element_visible(self, locator: tuple):
         """
@@ -37,7 +175,7 @@ class BasePage:
         Returns:
         - WebElement: The WebElement once it becomes visible.
         """
-        return self._wait.until(EC.visibility_of_element_located(locator))
+        return self.__wait(VISIBLE, locator)
 
     def __wait_until_element_invisible(self, locator: tuple):
         """
@@ -49,7 +187,7 @@ class BasePage:
         Returns:
         - bool: True if the element becomes invisible, False otherwise.
         """
-        return self._wait.until(EC.invisibility_of_element_located(locator))
+        return self.__wait(INVISIBLE, locator)
 
     def __wait_until_element_present(self, locator: tuple):
         """
@@ -61,7 +199,7 @@ class BasePage:
         Returns:
         - List[WebElement]: A list of WebElements once they are present.
          """
-        return self._wait.until(EC.presence_of_all_elements_located(locator))
+        return self.__wait(PRESENT, locator)
 
     def __wait_until_element_clickable(self, locator: tuple):
         """
@@ -73,7 +211,7 @@ class BasePage:
         Returns:
         - WebElement: The WebElement once it becomes clickable.
         """
-        return self._wait.until(EC.element_to_be_clickable(locator))
+        return self.__wait(CLICKABLE, locator)
 
     def send_keys(self, locator, value, is_clear=True):
         """
@@ -135,25 +273,29 @@ class BasePage:
          Returns:
         - bool: True if the element is displayed, False otherwise.
          """
-        label_element = self.__wait_until_element_visible(locator)
-        return label_element.is_displayed()
+        return bool(self.__wait(VISIBLE, locator, read=True))
 
-    def is_not_displayed(self, locator, timeout=10):
+    def is_not_displayed(self, locator, timeout=None, snapshot=False):
         """
         Checks if an element identified by the given locator is not displayed.
 
         Parameters:
         - locator: A tuple representing the locator strategy and value.
-        - timeout: Maximum time to wait for the element to become invisible (default is 10 seconds).
+        - timeout: Maximum time to wait for the element to become invisible (default is the learned timeout of
+          the locator, or 10 seconds).
+        - snapshot: If True, checks the current state of the page once without waiting.
 
         Returns:
         - bool: True if the element is not displayed within the specified timeout, False otherwise.
         """
+        if snapshot:
+            elements = self._driver.find_elements(*locator)
+            try:
+                return not elements or not elements[0].is_displayed()
+            except StaleElementReferenceException:
+                return True
         try:
-            WebDriverWait(self._driver, timeout).until(
-                EC.invisibility_of_element_located(locator)
-            )
-            return True
+            return self.__wait(INVISIBLE, locator, timeout=timeout, default_timeout=10)
         except TimeoutException:
             return False
 
@@ -167,8 +309,7 @@ class BasePage:
         Returns:
          - str: The text content of the element.
         """
-        element = self.__wait_until_element_visible(locator)
-        return element.text
+        return self.__wait(VISIBLE, locator, read="text")
 
     def get_numeric_price_value(self, locator):
         """
@@ -180,8 +321,7 @@ class BasePage:
         Returns:
         - str: The numeric value of the price element.
         """
-        element = self.__wait_until_element_visible(locator)
-        text = element.text.replace("₴", "").strip()
+        text = self.__wait(VISIBLE, locator, read="text").replace("₴", "").strip()
         return text
 
     def get_placeholder(self, locator):
@@ -224,6 +364,19 @@ class BasePage:
         element = self.__wait_until_element_visible(locator)
         return element
 
+    def get_present_element(self, locator):
+        """
+        Retrieves the first element identified by the given locator once it is present in the DOM,
+        whether or not it is visible.
+
+        Parameters:
+        - locator: A tuple representing the locator strategy and value.
+
+        Returns:
+        - WebElement: The first WebElement matching the specified locator.
+        """
+        return self.__wait_until_element_present(locator)[0]
+
     def get_element_data_item_qty(self, locator):
         """
          Retrieves the 'data-item-qty' attribute value of an element identified by the given locator.
@@ -234,8 +387,7 @@ class BasePage:
         Returns:
         - str: The value of the 'data-item-qty' attribute.
         """
-        element = self.__wait_until_element_visible(locator)
-        quantity = element.get_attribute("data-item-qty")
+        quantity = self.__wait(VISIBLE, locator, read="data-item-qty")
         return quantity
 
     def get_element_style(self, locator):
@@ -248,30 +400,31 @@ class BasePage:
         Returns:
         - str: The value of the 'style' attribute.
         """
-        element = self.__wait_until_element_visible(locator)
-        style = element.get_attribute("style")
+        style = self.__wait(VISIBLE, locator, read="style")
         return style
 
-    def click_via_js(self, locator, timeout=10):
+    def click_via_js(self, locator, timeout=None):
         """
         Clicks on an element using JavaScript to ensure it is visible and clickable.
 
         Parameters:
         - locator: A tuple representing the locator strategy and value.
-        - timeout: Maximum time to wait for the element to become clickable (in seconds).
+        - timeout: Maximum time to wait for the element to become clickable (in seconds; default is the learned
+          timeout of the locator, or 10 seconds).
 
         Returns:
         - None
 
+        Raises:
+        - TimeoutException: If the element is not clickable within the timeout actually waited (learned or
+          capped by the wait budget), which its message reports.
         """
         try:
-            element = self.__wait_until_element_clickable(locator)
+            element = self.__wait(CLICKABLE, locator, timeout=timeout, default_timeout=10)
             self._driver.execute_script("arguments[0].scrollIntoView(true);", element)
             element.click()
         except NoSuchElementException:
             raise NoSuchElementException(f"Element located by {locator} is not visible or not found.")
-        except TimeoutException:
-            raise TimeoutException(f"Element located by {locator} was not clickable within {timeout} seconds.")
 
     def scroll_via_js(self):
         """
@@ -311,18 +464,27 @@ class BasePage:
 
            Returns:
            - None
+
+           Note:
+           - The time spent retrying is recorded in 'click_retry_stats', per animation suppression mode.
            """
         max_retries = 15
         retries = 0
+        first_interception = None
 
-        while retries < max_retries:
-            try:
-                element = self.__wait_until_element_clickable(locator)
-                element.click()
-                break
-            except ElementClickInterceptedException:
-                retries += 1
-                time.sleep(2)
+        try:
+            while retries < max_retries:
+                try:
+                    element = self.__wait_until_element_clickable(locator)
+                    element.click()
+                    break
+                except ElementClickInterceptedException:
+                    first_interception = first_interception or time.monotonic()
+                    retries += 1
+                    time.sleep(2)
+        finally:
+            click_retry_stats.record(animations_disabled(self._driver), retries,
+                                     time.monotonic() - first_interception if first_interception else 0.0)
 
         if retries == max_retries:
             raise ElementClickInterceptedException("Exceeded maximum retry attempts for ElementClickInterceptedException")
@@ -0,0 +1,284 @@
+from selenium.common import JavascriptException, NoSuchElementException, TimeoutException
+
+from utilities.ui_utilities.base_page import BasePage
+from utilities.ui_utilities.wait_engines import run_async_script
+
+# Shared helpers of the scripts below. 'resolveSelect' accepts the <select> itself or any element of the
+# select2 container (select2 inserts its container right after the original <select>).
+_SELECT2_HELPERS = r"""
+function resolveSelect(element) {
+    if (element.tagName === "SELECT") { return element; }
+    var container = element.closest(".select2-container");
+    var select = container && container.previousElementSibling;
+    if (!select || select.tagName !== "SELECT") { throw new Error("No <select> found for the select2 widget"); }
+    return select;
+}
+function matches(text, expected, exact) {
+    text = (text || "").trim();
+    return exact ? text === expected : text.indexOf(expected) !== -1;
+}
+function waitFor(register, action, timeout, done) {
+    var finished = false;
+    function finish(result) { if (!finished) { finished = true; clearTimeout(timer); done(result); } }
+    var timer = setTimeout(function () { finish({status: "timeout"}); }, timeout);
+    register(function () { finish({status: "ok"}); });
+    try { action(); } catch (error) { finish({status: "error", message: String(error.message || error)}); }
+}
+"""
+
+# arguments: element, timeout (ms), callback
+_OPEN_SCRIPT = _SELECT2_HELPERS + r"""
+var done = arguments[arguments.length - 1], $select = jQuery(resolveSelect(arguments[0]));
+if ($select.data("select2").isOpen()) {
+    done({status: "ok"});
+} else {
+    waitFor(function (resolve) { $select.one("select2:open", resolve); },
+            function () { $select.select2("open"); }, arguments[1], done);
+}
+"""
+
+# arguments: element, term, timeout (ms), callback
+# Only results of the searched term count: open() starts a query for the empty term whose results may still be
+# on their way. select2 has no 'off', so the handlers are removed from its listener lists, after the current
+# event has been dispatched to all of them.
+_SEARCH_SCRIPT = _SELECT2_HELPERS + r"""
+var done = arguments[arguments.length - 1], $select = jQuery(resolveSelect(arguments[0])), term = arguments[1];
+var instance = $select.data("select2"), field = instance.dropdown.$search || instance.selection.$search;
+var events = ["results:all", "results:message"];
+function queryTerm(params) {
+    var query = params && (params.query || (params.args && params.args.params));
+    return query ? query.term || "" : null;
+}
+function onResults(params) {
+    var queried = queryTerm(params);
+    // Messages without a query (e.g. 'errorLoading') answer the current search: select2 drops stale failures.
+    if (queried === term || queried === null) { onResults.resolve(); }
+}
+function detach() {
+    setTimeout(function () {
+        events.forEach(function (event) {
+            var listeners = (instance.listeners || {})[event] || [], index = listeners.indexOf(onResults);
+            if (index !== -1) { listeners.splice(index, 1); }
+        });
+    }, 0);
+}
+if (field.val() === term && !instance.$results.find(".loading-results").length) {
+    done({status: "ok"});
+} else {
+    waitFor(function (resolve) {
+                onResults.resolve = resolve;
+                events.forEach(function (event) { instance.on(event, onResults); });
+            },
+            function () {
+                field.val(term);
+                field.trigger("input");
+            }, arguments[2], function (result) { detach(); done(result); });
+}
+"""
+
+# arguments: element, text, exact, timeout (ms), callback
+_CHOOSE_SCRIPT = _SELECT2_HELPERS + r"""
+var done = arguments[arguments.length - 1], $select = jQuery(resolveSelect(arguments[0]));
+var text = arguments[1], exact = arguments[2];
+var instance = $select.data("select2");
+var selectable = ".select2-results__option--selectable, .select2-results__option[aria-selected]";
+var options = instance.$results.find(selectable).filter(function () {
+    return matches(this.textContent, text, exact);
+});
+if (!options.length) {
+    done({status: "missing", available: instance.$results.find(".select2-results__option").map(function () {
+        return this.textContent.trim();
+    }).get()});
+} else {
+    waitFor(function (resolve) { $select.one("select2:select", resolve); },
+            function () { options.first().trigger("mouseup"); }, arguments[3], done);
+}
+"""
+
+# Selects through the select2 API without touching the widget: local options are selected directly,
+# otherwise the widget's data adapter (e.g. an AJAX lookup) is queried with the text.
+# arguments: element, text, exact, value, timeout (ms), callback
+_FAST_SELECT_SCRIPT = _SELECT2_HELPERS + r"""
+var done = arguments[arguments.length - 1], select = resolveSelect(arguments[0]), $select = jQuery(select);
+var text = arguments[1], exact = arguments[2], value = arguments[3], timeout = arguments[4];
+
+function apply(data) {
+    if (!$select.find("option").filter(function () { return this.value === String(data.id); }).length) {
+        $select.append(new Option(data.text, data.id, false, false));
+    }
+    $select.val(String(data.id)).trigger("change");
+    $select.trigger({type: "select2:select", params: {data: data}});
+    done({status: "ok"});
+}
+
+var local = Array.prototype.filter.call(select.options, function (option) {
+    return value !== null ? option.value === value : option.value !== "" && matches(option.text, text, exact);
+});
+if (local.length) {
+    apply({id: local[0].value, text: local[0].text});
+} else if (value !== null) {
+    done({status: "missing", available: Array.prototype.map.call(select.options, function (o) { return o.value; })});
+} else {
+    // A query answering after the timeout must not change the <select>: the caller has already given up.
+    var timedOut = false;
+    var timer = setTimeout(function () { timedOut = true; done({status: "timeout"}); }, timeout);
+    $select.data("select2").dataAdapter.query({term: text}, function (data) {
+        if (timedOut) { return; }
+        clearTimeout(timer);
+        var flat = [];
+        (data.results || []).forEach(function (item) { flat.push.apply(flat, item.children || [item]); });
+        var found = flat.filter(function (item) { return item.id !== undefined && matches(item.text, text, exact); });
+        if (found.length) {
+            apply(found[0]);
+        } else {
+            done({status: "missing", available: flat.map(function (item) { return item.text; })});
+        }
+    });
+}
+"""
+
+
+class Select2(BasePage):
+    """
+    Component driving a select2 dropdown through the widget's own events instead of sleeps.
+
+    Every step waits for the event select2 itself emits ('select2:open', loaded results, 'select2:select'),
+    so the component continues as soon as the widget is ready, including after slow AJAX lookups.
+
+    Attributes:
+    - fast_mode: If True, 'select_by_text' and 'select_by_value' set the value through the select2 API and
+      trigger 'change' without opening the widget. Set from the 'select2_fast_mode' env option.
+    - timeout: Maximum time in seconds to wait for each widget event.
+
+    Example:
+    town = Select2(driver, (By.XPATH, "(//span[contains(@class, 'select2-selection')])[1]"))
+    town.select_by_text("Київ", exact=True)
+    """
+    fast_mode = False
+    timeout = 30
+
+    def __init__(self, driver, locator):
+        """
+        Initializes the Select2 instance.
+
+        Parameters:
+        - driver: The WebDriver instance for interacting with the web page.
+        - locator: A tuple locating the underlying <select> or any element of its select2 container.
+        """
+        super().__init__(driver)
+        self.__locator = locator
+
+    def __run(self, script, target, *args):
+        """
+        Runs one of the widget scripts against the select2 and translates its status into exceptions.
+
+        Parameters:
+        - script: The asynchronous script to run.
+        - target: The searched text or value, used in error messages.
+        - args: Script arguments following the widget element.
+
+        Returns:
+        - dict: The result reported by the script.
+        """
+        element = self.get_present_element(self.__locator)
+        result = run_async_script(self._driver, self.timeout, script, element, *args)
+        if result["status"] == "timeout":
+            raise TimeoutException(f"select2 located by {self.__locator} did not respond within {self.timeout} "
+                                   f"seconds.")
+        if result["status"] == "error":
+            raise JavascriptException(result["message"])
+        if result["status"] == "missing":
+            raise NoSuchElementException(f"No option matching {target!r} in select2 located by {self.__locator}; "
+                                         f"available: {result['available']}")
+        return result
+
+    def open(self):
+        """
+        Opens the dropdown and waits for the 'select2:open' event.
+
+        Returns:
+        - self: The current instance for method chaining.
+        """
+        self.__run(_OPEN_SCRIPT, None, self.timeout * 1000)
+        return self
+
+    def search(self, text):
+        """
+        Types the text into the search field of the open dropdown and waits until the results are loaded.
+
+        Parameters:
+        - text: The search term.
+
+        Returns:
+        - self: The current instance for method chaining.
+        """
+        self.__run(_SEARCH_SCRIPT, text, text, self.timeout * 1000)
+        return self
+
+    def choose(self, text, exact=False):
+        """
+        Chooses a result of the open dropdown and waits for the 'select2:select' event.
+
+        Parameters:
+        - text: The text of the result.
+        - exact: If True, the result text must equal the given text, otherwise it must contain it.
+
+        Returns:
+        - self: The current instance for method chaining.
+        """
+        self.__run(_CHOOSE_SCRIPT, text, text, exact, self.timeout * 1000)
+        return self
+
+    def select_by_text(self, text, exact=False):
+        """
+        Selects the option with the given text: open, search, choose (or one API call in fast mode).
+
+        Parameters:
+        - text: The text of the option.
+        - exact: If True, the option text must equal the given text, otherwise it must contain it.
+
+        Returns:
+        - self: The current instance for method chaining.
+        """
+        if self.fast_mode:
+            self.__run(_FAST_SELECT_SCRIPT, text, text, exact, None, self.timeout * 1000)
+            return self
+        return self.open().search(text).choose(text, exact)
+
+    def select_by_value(self, value):
+        """
+        Selects the option with the given value of the underlying <select>.
+
+        Parameters:
+        - value: The value of the option.
+
+        Returns:
+        - self: The current instance for method chaining.
+        """
+        if self.fast_mode:
+            self.__run(_FAST_SELECT_SCRIPT, value, None, True, value, self.timeout * 1000)
+            return self
+        element = self.get_present_element(self.__locator)
+        text = self._driver.execute_script(_SELECT2_HELPERS + r"""
+            var value = arguments[1];
+            var option = Array.prototype.find.call(resolveSelect(arguments[0]).options, function (option) {
+                return option.value === value;
+            });
+            return option ? option.text : null;
+        """, element, value)
+        if text is None:
+            raise NoSuchElementException(f"No option with value {value!r} in select2 located by {self.__locator}")
+        return self.open().search(text).choose(text, exact=True)
+
+    def get_selected_text(self):
+        """
+        Retrieves the text of the selected option.
+
+        Returns:
+        - str: The text of the selected option, or an empty string if nothing is selected.
+        """
+        element = self.get_present_element(self.__locator)
+        return self._driver.execute_script(_SELECT2_HELPERS + r"""
+            var select = resolveSelect(arguments[0]);
+            return select.selectedIndex >= 0 ? select.options[select.selectedIndex].text.trim() : "";
+        """, element)
@@ -0,0 +1,137 @@
+import time
+from contextlib import contextmanager
+
+_active_budget = None
+
+
+class WaitBudgetExceeded(Exception):
+    """
+    Raised when the waits of a test have used up the whole wait budget.
+
+    Deliberately not a TimeoutException: callers that treat a timeout as a negative answer
+    (e.g. 'is_not_displayed') must not swallow it, the test has to fail right away.
+    """
+
+
+class WaitBudget:
+    """
+    Shared deadline that every element wait of a test draws from.
+
+    Each wait gets min(requested timeout, remaining budget), so chained page-object calls on a broken page
+    fail after the budget instead of after the sum of their individual timeouts. The clock starts with the
+    first wait, so browser start-up does not count against the budget.
+
+    Attributes:
+    - total: The budget in seconds.
+    - records: (label, condition, elapsed seconds, outcome) for every wait made against the budget.
+    """
+
+    def __init__(self, total):
+        """
+        Initializes the WaitBudget instance.
+
+        Parameters:
+        - total: The budget in seconds.
+        """
+        self.total = total
+        self.records = []
+        self.__deadline = None
+
+    def remaining(self):
+        """
+        Returns:
+        - float: Seconds left before the deadline (never negative).
+        """
+        if self.__deadline is None:
+            return float(self.total)
+        return max(0.0, self.__deadline - time.monotonic())
+
+    def is_exhausted(self):
+        """
+        Returns:
+        - bool: True if no time is left in the budget.
+        """
+        return self.remaining() <= 0
+
+    def timeout_for(self, requested, label=""):
+        """
+        Caps a wait timeout with the remaining budget.
+
+        Parameters:
+        - requested: The timeout the wait would use without a budget, in seconds.
+        - label: Description of the wait, used in the error message.
+
+        Returns:
+        - float: The timeout the wait may use.
+
+        Raises:
+        - WaitBudgetExceeded: If the budget is already used up.
+        """
+        if self.__deadline is None:
+            self.__deadline = time.monotonic() + self.total
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise WaitBudgetExceeded(self.breakdown(f"Wait budget exhausted before {label}"))
+        return min(requested, remaining)
+
+    def record(self, label, condition, elapsed, outcome):
+        """
+        Records a finished wait.
+
+        Parameters:
+        - label: Description of the wait (page class and locator).
+        - condition: The wait condition (visible, invisible, clickable, present).
+        - elapsed: Seconds the wait took.
+        - outcome: 'ok' or 'timeout'.
+        """
+        self.records.append((label, condition, elapsed, outcome))
+
+    def breakdown(self, title=None):
+        """
+        Builds a report of where the waiting time went, slowest waits first.
+
+        Parameters:
+        - title: Optional first line of the report.
+
+        Returns:
+        - str: The report.
+        """
+        totals = {}
+        for label, condition, elapsed, outcome in self.records:
+            key = (label, condition)
+            count, spent, timeouts = totals.get(key, (0, 0.0, 0))
+            totals[key] = (count + 1, spent + elapsed, timeouts + (outcome == "timeout"))
+        spent_total = sum(elapsed for _, _, elapsed, _ in self.records)
+        lines = [title or "Wait budget breakdown",
+                 f"budget {self.total:.1f}s, spent waiting {spent_total:.2f}s in {len(self.records)} waits"]
+        for (label, condition), (count, spent, timeouts) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {spent:8.2f}s  {count:3d}x  {condition:<9}  {label}"
+                         + (f"  ({timeouts} timed out)" if timeouts else ""))
+        return "\n".join(lines)
+
+
+def current_budget():
+    """
+    Returns:
+    - WaitBudget or None: The budget of the running test, if any.
+    """
+    return _active_budget
+
+
+@contextmanager
+def wait_budget(total):
+    """
+    Activates a wait budget for the duration of the block.
+
+    Parameters:
+    - total: The budget in seconds.
+
+    Yields:
+    - WaitBudget: The active budget.
+    """
+    global _active_budget
+    previous, _active_budget = _active_budget, WaitBudget(total)
+    try:
+        yield _active_budget
+    finally:
+        _active_budget = previous
@@ -0,0 +1,301 @@
+import time
+import weakref
+
+from selenium.common import JavascriptException, TimeoutException
+
+VISIBLE = "visible"
+INVISIBLE = "invisible"
+CLICKABLE = "clickable"
+PRESENT = "present"
+
+# Extra script timeout so that the in-browser timer of a script always fires before the driver gives up.
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# The script timeout last set on each driver (it is driver-wide).
+_script_timeouts = weakref.WeakKeyDictionary()
+
+# Resolves the condition inside the browser. Re-evaluation is triggered by DOM mutations, by the
+# IntersectionObserver of the current candidate element (layout changes that do not touch the DOM) and by
+# transition/animation end events, with a slow fallback timer for anything none of those report.
+# arguments: by, value, condition, timeout (ms), fallback interval (ms), callback
+
+OBSERVER_WAIT_SCRIPT = r"""
+var by = arguments[0], value = arguments[1], condition = arguments[2];
+var timeout = arguments[3], fallbackInterval = arguments[4], done = arguments[arguments.length - 1];
+
+function findAll() {
+    switch (by) {
+        case "xpath":
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+        case "css selector":
+            return Array.prototype.slice.call(document.querySelectorAll(value));
+        case "id":
+            return Array.prototype.slice.call(document.querySelectorAll("#" + CSS.escape(value)));
+        case "name":
+            return Array.prototype.slice.call(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case "class name":
+            return Array.prototype.slice.call(document.getElementsByClassName(value));
+        case "tag name":
+            return Array.prototype.slice.call(document.getElementsByTagName(value));
+        case "link text":
+        case "partial link text":
+            return Array.prototype.filter.call(document.getElementsByTagName("a"), function (a) {
+                var text = a.textContent.trim();
+                return by === "link text" ? text === value : text.indexOf(value) !== -1;
+            });
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+
+function isShown(element) {
+    if (!element.isConnected) { return false; }
+    for (var node = element; node && node.nodeType === 1; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.display === "none" || Number(style.opacity) === 0) { return false; }
+    }
+    var own = window.getComputedStyle(element);
+    if (own.visibility === "hidden" || own.visibility === "collapse") { return false; }
+    var rects = element.getClientRects();
+    for (var r = 0; r < rects.length; r++) {
+        if (rects[r].width > 0 && rects[r].height > 0) { return true; }
+    }
+    return false;
+}
+
+var candidate = null;
+
+function evaluate() {
+    var elements = findAll();
+    candidate = elements.length ? elements[0] : null;
+    switch (condition) {
+        case "present":
+            return elements.length ? {value: elements} : null;
+        case "visible":
+            return candidate && isShown(candidate) ? {value: candidate} : null;
+        case "clickable":
+            return candidate && isShown(candidate) && !candidate.disabled ? {value: candidate} : null;
+        case "invisible":
+            return !candidate || !isShown(candidate) ? {value: true} : null;
+    }
+    throw new Error("Unsupported wait condition: " + condition);
+}
+
+var finished = false, observed = null, mutationObserver, intersectionObserver, fallbackTimer, timeoutTimer;
+
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    mutationObserver.disconnect();
+    if (intersectionObserver) { intersectionObserver.disconnect(); }
+    clearInterval(fallbackTimer);
+    clearTimeout(timeoutTimer);
+    document.removeEventListener("transitionend", check, true);
+    document.removeEventListener("animationend", check, true);
+    done(result);
+}
+
+function check() {
+    if (finished) { return; }
+    var result;
+    try {
+        result = evaluate();
+    } catch (error) {
+        finish({status: "error", message: String(error && error.message || error)});
+        return;
+    }
+    if (result) {
+        finish({status: "ok", value: result.value});
+        return;
+    }
+    if (intersectionObserver && candidate !== observed) {
+        if (observed) { intersectionObserver.unobserve(observed); }
+        if (candidate) { intersectionObserver.observe(candidate); }
+        observed = candidate;
+    }
+}
+
+mutationObserver = new MutationObserver(check);
+mutationObserver.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+if (window.IntersectionObserver) { intersectionObserver = new IntersectionObserver(check); }
+document.addEventListener("transitionend", check, true);
+document.addEventListener("animationend", check, true);
+fallbackTimer = setInterval(check, fallbackInterval);
+timeoutTimer = setTimeout(function () { finish({status: "timeout"}); }, timeout);
+check();
+"""
+
+
+class PollingWait:
+    """
+    Wait engine polling the condition from the client with WebDriverWait (one round trip per poll).
+
+    Attributes:
+    - _driver: The WebDriver instance.
+    - _timeout: Default timeout of every wait in seconds.
+    - poll_interval: Default poll interval in seconds.
+    """
+    poll_interval = 0.5
+
+    def __init__(self, driver, timeout):
+        """
+        Initializes the PollingWait instance.
+
+        Parameters:
+        - driver: The WebDriver instance.
+        - timeout: Default timeout of every wait in seconds.
+        """
+        self._driver = driver
+        self._timeout = timeout
+
+    def until(self, condition, locator, timeout=None, poll=None):
+        """
+        Waits until the condition holds for the element identified by the given locator.
+
+        Parameters:
+        - condition: One of VISIBLE, INVISIBLE, CLICKABLE or PRESENT.
+        - locator: A tuple representing the locator strategy and value.
+        - timeout: Optional timeout in seconds overriding the default one.
+        - poll: Optional poll interval in seconds overriding the default one.
+
+        Returns:
+        - WebElement for VISIBLE and CLICKABLE, a list of WebElements for PRESENT, True for INVISIBLE.
+
+        Raises:
+        - TimeoutException: If the condition does not hold within the timeout.
+        """
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        expected_conditions = {
+            VISIBLE: EC.visibility_of_element_located,
+            INVISIBLE: EC.invisibility_of_element_located,
+            CLICKABLE: EC.element_to_be_clickable,
+            PRESENT: EC.presence_of_all_elements_located
+        }
+        timeout = self._timeout if timeout is None else timeout
+        wait = WebDriverWait(self._driver, timeout, poll_frequency=self.poll_interval if poll is None else poll)
+        return wait.until(expected_conditions[condition](locator),
+                          message=f"Element located by {locator} was not {condition} within {timeout} seconds.")
+
+
+def run_async_script(driver, timeout, script, *args):
+    """
+    Runs an asynchronous script with a driver script timeout long enough for it.
+
+    The script timeout is shared by every execute_async_script call of the driver. The wait and select2 scripts
+    end themselves with their own in-browser timer, so a larger driver timeout left by an earlier caller does
+    not make them wait longer: the timeout is remembered per driver and only raised when a script needs more,
+    which keeps most calls to a single round trip.
+
+    Parameters:
+    - driver: The WebDriver instance.
+    - timeout: Seconds the script may run (the script's own timer, if any); SCRIPT_TIMEOUT_MARGIN is added.
+    - script: The asynchronous script.
+    - args: The script arguments.
+
+    Returns:
+    - The value the script passed to its callback.
+    """
+    script_timeout = timeout + SCRIPT_TIMEOUT_MARGIN
+    if _script_timeouts.get(driver, 0) < script_timeout:
+        driver.set_script_timeout(script_timeout)
+        _script_timeouts[driver] = script_timeout
+    return driver.execute_async_script(script, *args)
+
+
+class ObserverWait:
+    """
+    Wait engine resolving the condition inside the browser.
+
+    A single execute_async_script call installs a MutationObserver (plus an IntersectionObserver on the
+    candidate element) and returns as soon as the condition holds, together with the element itself, so one
+    round trip replaces a whole polling loop and no poll interval is added on top of the page's own latency.
+
+    Attributes:
+    - _driver: The WebDriver instance.
+    - _timeout: Default timeout of every wait in seconds.
+    - fallback_interval: In-browser re-check interval in seconds for changes no observer reports.
+    """
+    fallback_interval = 0.1
+    __max_retry_delay = 1.0
+
+    def __init__(self, driver, timeout):
+        """
+        Initializes the ObserverWait instance.
+
+        Parameters:
+        - driver: The WebDriver instance.
+        - timeout: Default timeout of every wait in seconds.
+        """
+        self._driver = driver
+        self._timeout = timeout
+
+    def until(self, condition, locator, timeout=None, poll=None):
+        """
+        Waits until the condition holds for the element identified by the given locator.
+
+        Parameters:
+        - condition: One of VISIBLE, INVISIBLE, CLICKABLE or PRESENT.
+        - locator: A tuple representing the locator strategy and value.
+        - timeout: Optional timeout in seconds overriding the default one.
+        - poll: Optional in-browser re-check interval in seconds overriding 'fallback_interval'.
+
+        Returns:
+        - WebElement for VISIBLE and CLICKABLE, a list of WebElements for PRESENT, True for INVISIBLE.
+
+        Raises:
+        - TimeoutException: If the condition does not hold within the timeout.
+        """
+        timeout = self._timeout if timeout is None else timeout
+        poll = self.fallback_interval if poll is None else poll
+        deadline = time.monotonic() + timeout
+        by, value = locator
+        retry_delay = poll
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                result = run_async_script(self._driver, timeout, OBSERVER_WAIT_SCRIPT, by, value, condition,
+                                          int(remaining * 1000), int(poll * 1000))
+            except JavascriptException:
+                # Usually the document was unloaded mid-wait (navigation); observe the new one. The pause,
+                # doubling up to a second, keeps an error that keeps coming back from flooding the driver.
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException(f"Element located by {locator} was not {condition} within {timeout} "
+                                           f"seconds.")
+                time.sleep(min(retry_delay, remaining))
+                retry_delay = min(retry_delay * 2, self.__max_retry_delay)
+                continue
+            if result["status"] == "ok":
+                return result["value"]
+            if result["status"] == "error":
+                raise JavascriptException(result["message"])
+            raise TimeoutException(f"Element located by {locator} was not {condition} within {timeout} seconds.")
+
+
+WAIT_ENGINES = {
+    "polling": PollingWait,
+    "observer": ObserverWait
+}
+
+
+def create_wait_engine(name, driver, timeout):
+    """
+    Create a wait engine by its name.
+
+    Parameters:
+    - name: The engine name, a key of WAIT_ENGINES ('polling' or 'observer').
+    - driver: The WebDriver instance.
+    - timeout: Default timeout of every wait in seconds.
+
+    Returns:
+    - PollingWait or ObserverWait instance.
+    """
+    try:
+        engine_class = WAIT_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown wait engine '{name}', expected one of {sorted(WAIT_ENGINES)}") from None
+    return engine_class(driver, timeout)